@@ -0,0 +1,116 @@
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+
+from Benchmarks.synthetic_chart_data import scales, generate_chart_data
+from Chart_Builders.AUM_engine import slice_portfolio_data
+from Chart_Builders.single_portfolio_AUM_line_chart import build_single_portfolio_AUM_line_chart
+from Chart_Builders.total_fund_AUM_line_chart import build_total_fund_AUM_line_chart
+from Chart_Builders.all_stock_returns_scatter_chart import build_all_stock_returns_scatter_chart
+from Chart_Builders.chart_renderer import Chart_Renderer
+from Slide_Builders.Single_Portfolio_AUM_Slide import Single_Portfolio_AUM_Slide
+
+BENCHMARK_RATE = 0.08
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), 'benchmark_results.json')
+REGRESSION_TOLERANCE = 0.2 # Flag benchmarks more than 20% slower than the previous run at the same scale
+
+def measure(function, *args, repeats: int = 3) -> dict:
+    # Time untraced runs, since tracemalloc slows down Python-level code
+    wall_times = []
+    for i in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        function(*args)
+        wall_times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    function(*args)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'wall_seconds': min(wall_times), 'peak_memory_mb': peak_memory / 1024 ** 2}
+
+def get_benchmark_series(num_weeks: int) -> list[float]:
+    weekly_return_rate = (1 + BENCHMARK_RATE) ** (1 / 52) - 1
+    return list((1 + weekly_return_rate) ** np.arange(1, num_weeks + 1))
+
+def build_single_portfolio_AUM_slide(data, benchmark_series):
+    # An unrendered renderer keeps the slide to its statistics and figures, with no image export
+    slide = Single_Portfolio_AUM_Slide(data, BENCHMARK_RATE, benchmark_series, '', Chart_Renderer())
+
+    # Charts are built on first access
+    slide.line_chart_path, slide.bar_chart_path
+
+    return slide
+
+def run_scale(scale: str, repeats: int, seed: int) -> dict:
+    sizes = scales[scale]
+
+    print(f'Generating {scale} chart data: {sizes}')
+    data = generate_chart_data(**sizes, seed = seed)
+    total_fund_AUM_data = data['total_fund_AUM_data']
+    single_portfolio_AUM_data = slice_portfolio_data(total_fund_AUM_data, 1)
+    benchmark_series = get_benchmark_series(sizes['num_weeks'])
+    weekly_rate = (1 + BENCHMARK_RATE) ** (1 / 52)
+
+    benchmarks = {
+        'build_single_portfolio_AUM_line_chart': (build_single_portfolio_AUM_line_chart, benchmark_series, single_portfolio_AUM_data),
+        'build_total_fund_AUM_line_chart': (build_total_fund_AUM_line_chart, weekly_rate, total_fund_AUM_data),
+        'build_all_stock_returns_scatter_chart': (build_all_stock_returns_scatter_chart, data['all_stock_returns_data']),
+        'Single_Portfolio_AUM_Slide': (build_single_portfolio_AUM_slide, single_portfolio_AUM_data, benchmark_series)
+    }
+
+    results = dict()
+    for name, (function, *args) in benchmarks.items():
+        results[name] = measure(function, *args, repeats = repeats)
+        print(f'{name}: {results[name]["wall_seconds"]:.3f} s, {results[name]["peak_memory_mb"]:,.1f} MB peak')
+
+    return {'scale': scale, 'sizes': sizes, 'rows': len(total_fund_AUM_data), 'results': results}
+
+def find_regressions(run: dict, previous_runs: list[dict]) -> list[str]:
+    previous = [previous_run for previous_run in previous_runs if previous_run['sizes'] == run['sizes']]
+    if not previous:
+        return []
+
+    regressions = []
+    for name, result in run['results'].items():
+        previous_result = previous[-1]['results'].get(name)
+
+        if previous_result and result['wall_seconds'] > previous_result['wall_seconds'] * (1 + REGRESSION_TOLERANCE):
+            regressions.append(f'{run["scale"]} {name}: {previous_result["wall_seconds"]:.3f} s -> {result["wall_seconds"]:.3f} s')
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the chart builders on synthetic data without a database')
+    parser.add_argument('--scales', nargs = '+', choices = list(scales), default = ['small', 'medium'])
+    parser.add_argument('--repeats', type = int, default = 3)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--output', default = RESULTS_FILE)
+    args = parser.parse_args()
+
+    previous_runs = []
+    if os.path.exists(args.output):
+        with open(args.output) as file:
+            previous_runs = json.load(file)
+
+    timestamp = datetime.now().isoformat(timespec = 'seconds')
+    runs = [dict(run_scale(scale, args.repeats, args.seed), timestamp = timestamp) for scale in args.scales]
+
+    regressions = [regression for run in runs for regression in find_regressions(run, previous_runs)]
+    for regression in regressions:
+        print(f'Regression: {regression}')
+
+    with open(args.output, 'w') as file:
+        json.dump(previous_runs + runs, file, indent = 4)
+
+    print(f'Benchmark results saved to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+LAST_FRIDAY = np.datetime64('2024-05-31') # Last week with price data, matching the charting queries
+PRICE_CHANGES = 1 + np.arange(-2.0, 2.5, 0.2) / 100 # Same weekly moves as Data_Generators/stock_prices_generator.py
+STRATEGIES = ['Active', 'Passive', 'Discretionary', 'Non-discretionary']
+
+# Sizes the benchmark suite runs at. Weeks shrink as the fund grows so the holdings x prices
+# frame, which has one row per holding per week, still fits in memory.
+scales = {
+    'small': {'num_portfolios': 200, 'num_stocks': 500, 'num_weeks': 1743},
+    'medium': {'num_portfolios': 2000, 'num_stocks': 2000, 'num_weeks': 520},
+    'large': {'num_portfolios': 20000, 'num_stocks': 10000, 'num_weeks': 52}
+}
+
+def get_fridays(num_weeks: int) -> np.ndarray:
+    return LAST_FRIDAY - np.arange(num_weeks - 1, -1, -1) * np.timedelta64(7, 'D')
+
+def generate_tickers(amount: int, rng: np.random.Generator) -> np.ndarray:
+    letters = rng.integers(ord('A'), ord('Z') + 1, size = (amount, 4), dtype = np.uint8)
+    tickers = letters.view('S4').ravel().astype(str)
+
+    # Suffix with the row number so every ticker stays unique at large sizes
+    return np.char.add(tickers, np.arange(amount).astype(str))
+
+def generate_stock_prices(num_stocks: int, num_weeks: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    # Every stock lists on a random week, leaving at least two weekly prices before the last Friday
+    ipo_weeks = rng.integers(0, num_weeks - 1, num_stocks)
+
+    ipo_prices = rng.uniform(5, 200, size = (num_stocks, 1))
+    prices = np.round(ipo_prices * np.cumprod(rng.choice(PRICE_CHANGES, size = (num_stocks, num_weeks)), axis = 1), 2)
+
+    return ipo_weeks, prices
+
+def generate_chart_data(num_portfolios: int, num_stocks: int, num_weeks: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+
+    fridays = get_fridays(num_weeks)
+    ipo_weeks, prices = generate_stock_prices(num_stocks, num_weeks, rng)
+
+    portfolio_start_weeks = rng.integers(0, num_weeks - 1, num_portfolios)
+    portfolio_years = fridays[portfolio_start_weeks].astype('datetime64[Y]').astype(int) + 1970
+    starting_capitals = rng.choice(np.arange(2000000, 20000000, 2000000), num_portfolios).astype(float)
+    portfolio_names = generate_tickers(num_portfolios, rng)
+
+    # Each portfolio holds a run of consecutive stock ids from a random offset, so no stock repeats within a portfolio
+    holdings_counts = np.minimum(rng.choice(np.arange(5, 51, 5), num_portfolios), num_stocks)
+    holding_portfolios = np.repeat(np.arange(num_portfolios), holdings_counts)
+    first_holding = np.cumsum(holdings_counts) - holdings_counts
+    holding_offsets = np.arange(len(holding_portfolios)) - np.repeat(first_holding, holdings_counts)
+    holding_stocks = (rng.integers(0, num_stocks, num_portfolios)[holding_portfolios] + holding_offsets) % num_stocks
+
+    purchase_weeks = np.maximum(ipo_weeks[holding_stocks], portfolio_start_weeks[holding_portfolios])
+    investment_per_stock = starting_capitals[holding_portfolios] / holdings_counts[holding_portfolios]
+    shares = np.floor(investment_per_stock / prices[holding_stocks, purchase_weeks]).astype(np.int64)
+
+    # Explode every holding into one row per week from its purchase to the last Friday
+    weeks_held = num_weeks - purchase_weeks
+    row_holdings = np.repeat(np.arange(len(holding_stocks)), weeks_held)
+    first_row = np.cumsum(weeks_held) - weeks_held
+    row_weeks = purchase_weeks[row_holdings] + np.arange(len(row_holdings)) - np.repeat(first_row, weeks_held)
+
+    row_portfolios = holding_portfolios[row_holdings]
+    row_stocks = holding_stocks[row_holdings]
+
+    # Same ordering as total_fund_AUM_query: ORDER BY p.id, sp.date
+    order = np.lexsort((row_weeks, row_portfolios))
+
+    total_fund_AUM_data = pd.DataFrame({
+        'id': row_portfolios[order] + 1,
+        'name': portfolio_names[row_portfolios[order]],
+        'year_established': portfolio_years[row_portfolios[order]],
+        'starting_capital': starting_capitals[row_portfolios[order]],
+        'stock_id': row_stocks[order] + 1,
+        'shares_purchased': shares[row_holdings[order]],
+        'purchase_date': fridays[purchase_weeks[row_holdings[order]]],
+        'price': prices[row_stocks[order], row_weeks[order]],
+        'date': fridays[row_weeks[order]]
+    })
+
+    # Same shape as all_stock_returns_query: each stock's first price and its price on the last Friday
+    stock_ids = np.arange(num_stocks)
+    tickers = generate_tickers(num_stocks, rng)
+    all_stock_returns_data = pd.DataFrame({
+        'id': np.concatenate([stock_ids, stock_ids]) + 1,
+        'ticker': np.concatenate([tickers, tickers]),
+        'ipo_date': np.concatenate([fridays[ipo_weeks], fridays[ipo_weeks]]),
+        'date': np.concatenate([fridays[ipo_weeks], np.full(num_stocks, fridays[-1])]),
+        'price': np.concatenate([prices[stock_ids, ipo_weeks], prices[stock_ids, -1]])
+    }).sort_values('id', kind = 'stable', ignore_index = True)
+
+    strategies = rng.choice(STRATEGIES, num_portfolios)
+    strategy_comparison_data = pd.Series(strategies).value_counts().rename_axis('strategy').reset_index(name = 'total')
+
+    return {
+        'total_fund_AUM_data': total_fund_AUM_data,
+        'strategy_comparison_data': strategy_comparison_data,
+        'all_stock_returns_data': all_stock_returns_data
+    }
@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+
+from Utilities.trading_calendar import Trading_Calendar, get_fund_calendar, get_compounding_series
+
+def compute_weekly_holdings_totals(data: pd.DataFrame, keys: tuple[str] = ('date',), purchased: pd.Series = None) -> pd.DataFrame:
+    # Rows without a price date come from holdings that never traded, they carry no AUM
+    holdings = data.dropna(subset = ['date']).sort_values(list(keys), kind = 'stable')
+
+    # Data from the aggregated queries already holds one row per week with these totals
+    if 'market_value' in holdings.columns:
+        return holdings[[*keys, 'market_value', 'purchase_cost']].reset_index(drop = True)
+
+    holding_values = holdings['price'] * holdings['shares_purchased']
+
+    # A stock is purchased the first week it appears, so its value on that week is drawn from uninvested capital
+    first_purchases = ~holdings.duplicated([*keys[:-1], 'stock_id'])
+
+    # Rows of holdings already bought before this data starts are never purchases
+    if purchased is not None:
+        first_purchases &= ~purchased.reindex(holdings.index, fill_value = False)
+    purchase_costs = holding_values.where(first_purchases, 0)
+
+    totals = holdings[list(keys)].assign(market_value = holding_values, purchase_cost = purchase_costs)
+    totals = totals.groupby(list(keys), sort = True)[['market_value', 'purchase_cost']].sum()
+
+    return totals.reset_index()
+
+def compute_single_portfolio_AUM(benchmark_series: list[float], data: pd.DataFrame, snapshot_store = None) -> pd.DataFrame:
+    starting_capital = data.loc[0, 'starting_capital']
+
+    # A snapshot store only computes the weeks newer than its stored history
+    if snapshot_store is not None:
+        weekly_AUMs = snapshot_store.update(data)
+    else:
+        weekly_totals = compute_weekly_holdings_totals(data)
+
+        # Cash left over after each week's purchases
+        remaining_uninvested_capital = starting_capital - weekly_totals['purchase_cost'].cumsum()
+        weekly_AUMs = weekly_totals.assign(AUM = (weekly_totals['market_value'] + remaining_uninvested_capital).round(2))
+
+    benchmark_AUMs = starting_capital * np.asarray(benchmark_series, dtype = float)[:len(weekly_AUMs)]
+
+    return pd.DataFrame({'Date': weekly_AUMs['date'].to_numpy(),
+                         'Portfolio AUM': weekly_AUMs['AUM'].to_numpy(),
+                         'Benchmark AUM': benchmark_AUMs})
+
+def compute_portfolio_AUMs(data: pd.DataFrame) -> pd.DataFrame:
+    weekly_totals = compute_weekly_holdings_totals(data, ('id', 'date'))
+
+    starting_capitals = data.groupby('id')['starting_capital'].first()
+
+    # Each portfolio draws its purchases from its own starting capital
+    cumulative_purchases = weekly_totals.groupby('id')['purchase_cost'].cumsum()
+    remaining_uninvested_capital = weekly_totals['id'].map(starting_capitals) - cumulative_purchases
+
+    weekly_totals['AUM'] = (weekly_totals['market_value'] + remaining_uninvested_capital).round(2)
+
+    return weekly_totals[['id', 'date', 'AUM']]
+
+def compute_fund_weekly_totals(data: pd.DataFrame, calendar: Trading_Calendar, snapshot_store = None) -> tuple[np.ndarray, np.ndarray]:
+    portfolio_AUMs = compute_portfolio_AUMs(data) if snapshot_store is None else snapshot_store.update(data)
+    starting_capitals = data.groupby('id')['starting_capital'].first()
+
+    # Scatter every portfolio's weekly AUM into a dense week x portfolio matrix in one pass
+    week_positions = calendar.get_week_offsets(portfolio_AUMs['date'].to_numpy(dtype = 'datetime64[D]'))
+    portfolio_positions, portfolio_ids = pd.factorize(portfolio_AUMs['id'])
+
+    on_calendar = week_positions >= 0
+    week_positions = week_positions[on_calendar]
+    portfolio_positions = portfolio_positions[on_calendar]
+
+    AUM_matrix = np.zeros((len(calendar), len(portfolio_ids)))
+    AUM_matrix[week_positions, portfolio_positions] = portfolio_AUMs['AUM'].to_numpy()[on_calendar]
+
+    held_matrix = np.zeros(AUM_matrix.shape, dtype = bool)
+    held_matrix[week_positions, portfolio_positions] = True
+
+    # A portfolio's starting capital is injected into the fund on the first week it reports an AUM
+    has_AUM = held_matrix.any(axis = 0)
+    first_weeks = held_matrix.argmax(axis = 0)[has_AUM]
+    external_capital = np.bincount(first_weeks,
+                                   weights = starting_capitals.reindex(portfolio_ids).to_numpy(dtype = float)[has_AUM],
+                                   minlength = len(calendar))
+
+    return AUM_matrix.sum(axis = 1), external_capital
+
+def compute_fund_benchmark(weekly_rate: float, fund_AUMs: np.ndarray, external_capital: np.ndarray) -> np.ndarray:
+    # Benchmark follows b[k] = (b[k - 1] + external_capital[k]) * weekly_rate, starting from the first fund AUM,
+    # which unrolls to b[k] = weekly_rate ** k * (b[0] + sum(external_capital[j] * weekly_rate ** (1 - j) for j in 1..k))
+    growth = get_compounding_series(weekly_rate, len(fund_AUMs))
+    discounted_capital = external_capital * weekly_rate / growth
+    discounted_capital[:1] = 0
+
+    return growth * (fund_AUMs[:1].sum() + np.cumsum(discounted_capital))
+
+def compute_total_fund_AUM(weekly_rate: float, data: pd.DataFrame, calendar: Trading_Calendar, snapshot_store = None) -> pd.DataFrame:
+    portfolio_AUM_totals, external_capital = compute_fund_weekly_totals(data, calendar, snapshot_store)
+
+    fund_AUMs = np.round(portfolio_AUM_totals + external_capital, 2)
+    benchmark_fund_AUMs = compute_fund_benchmark(weekly_rate, fund_AUMs, external_capital)
+
+    return pd.DataFrame({'Date': calendar.get_dates(), 'Fund AUM': fund_AUMs, 'Benchmark AUM': benchmark_fund_AUMs})
+
+def slice_portfolio_data(data: pd.DataFrame, portfolio_id: int) -> pd.DataFrame:
+    # Matches the row order of the single portfolio query, which sorts one portfolio's rows by date
+    portfolio_data = data[data['id'] == portfolio_id].sort_values('date', kind = 'stable')
+
+    # An unknown id would otherwise surface later as a KeyError deep in the AUM computation
+    if portfolio_data.empty:
+        raise ValueError(f'Portfolio {portfolio_id} has no rows in the fund data')
+
+    return portfolio_data.reset_index(drop = True)
+
+class Total_Fund_AUM_Aggregator:
+    def __init__(self, retained_portfolio_id: int = None):
+        self.first_year = None
+
+        # Weekly sums of portfolio AUMs and capital injections, keyed by date, are all that is kept between chunks
+        self.portfolio_AUM_totals = pd.Series(dtype = float)
+        self.external_capital = pd.Series(dtype = float)
+
+        # Rows of the portfolio that may continue into the next chunk
+        self.carried_rows = None
+
+        # Rows of one portfolio kept whole so the single portfolio slide can still be built from a streamed load
+        self.retained_portfolio_id = retained_portfolio_id
+        self.retained_rows = []
+
+    def add_chunk(self, chunk: pd.DataFrame) -> None:
+        if self.retained_portfolio_id is not None:
+            retained_rows = chunk[chunk['id'] == self.retained_portfolio_id]
+
+            # Most chunks hold none of the portfolio, and concatenating empty frames is deprecated
+            if not retained_rows.empty:
+                self.retained_rows.append(retained_rows)
+
+        if self.carried_rows is not None:
+            chunk = pd.concat([self.carried_rows, chunk], ignore_index = True)
+
+        # Rows arrive ordered by portfolio id, so only the last portfolio in a chunk can be incomplete
+        last_id = chunk['id'].iloc[-1]
+        is_last_portfolio = chunk['id'] == last_id
+
+        self.carried_rows = chunk[is_last_portfolio]
+        self.accumulate(chunk[~is_last_portfolio])
+
+    def accumulate(self, data: pd.DataFrame) -> None:
+        if data.empty:
+            return
+
+        first_year = data['year_established'].min()
+        self.first_year = first_year if self.first_year is None else min(self.first_year, first_year)
+
+        # Every fund calendar lands on the same Fridays, so this chunk's calendar is a subset of the final one
+        calendar = get_fund_calendar(first_year)
+        portfolio_AUM_totals, external_capital = compute_fund_weekly_totals(data, calendar)
+
+        self.portfolio_AUM_totals = self.portfolio_AUM_totals.add(pd.Series(portfolio_AUM_totals, index = calendar.weeks), fill_value = 0)
+        self.external_capital = self.external_capital.add(pd.Series(external_capital, index = calendar.weeks), fill_value = 0)
+
+    def get_retained_portfolio_data(self) -> pd.DataFrame:
+        if not self.retained_rows:
+            raise ValueError(f'No rows of portfolio {self.retained_portfolio_id} were found in the streamed data')
+
+        return slice_portfolio_data(pd.concat(self.retained_rows, ignore_index = True), self.retained_portfolio_id)
+
+    def finish(self, weekly_rate: float) -> pd.DataFrame:
+        if self.carried_rows is not None:
+            self.accumulate(self.carried_rows)
+            self.carried_rows = None
+
+        calendar = get_fund_calendar(self.first_year)
+        portfolio_AUM_totals = self.portfolio_AUM_totals.reindex(calendar.weeks, fill_value = 0).to_numpy()
+        external_capital = self.external_capital.reindex(calendar.weeks, fill_value = 0).to_numpy()
+
+        fund_AUMs = np.round(portfolio_AUM_totals + external_capital, 2)
+        benchmark_fund_AUMs = compute_fund_benchmark(weekly_rate, fund_AUMs, external_capital)
+
+        return pd.DataFrame({'Date': calendar.get_dates(), 'Fund AUM': fund_AUMs, 'Benchmark AUM': benchmark_fund_AUMs})
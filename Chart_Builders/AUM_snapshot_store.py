@@ -0,0 +1,153 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+from Chart_Builders.AUM_engine import compute_weekly_holdings_totals, compute_portfolio_AUMs
+
+def get_holdings(data: pd.DataFrame) -> pd.DataFrame:
+    # The data repeats every holding once per priced week, so find the first row of each portfolio and stock
+    # before touching any other column. Unheld portfolios carry a null stock id, which keys as -1
+    ids = data['id'].to_numpy(dtype = np.int64)
+    stock_ids = data['stock_id'].to_numpy()
+
+    if not np.issubdtype(stock_ids.dtype, np.integer):
+        stock_ids = np.where(np.isnan(stock_ids.astype(float)), -1, stock_ids).astype(np.int64)
+
+    holding_keys = ids * (stock_ids.max(initial = 0) + 2) + stock_ids + 1
+    first_rows = np.flatnonzero(~pd.Series(holding_keys).duplicated().to_numpy())
+
+    # Normalize the dtypes so compacted and uncompacted loads of the same holdings hash alike
+    return pd.DataFrame({
+        'id': ids[first_rows],
+        'stock_id': data['stock_id'].to_numpy()[first_rows].astype(float),
+        'shares_purchased': data['shares_purchased'].to_numpy()[first_rows].astype(float),
+        'purchase_date': pd.to_datetime(data['purchase_date'].to_numpy()[first_rows]).to_numpy(dtype = 'datetime64[ns]'),
+        'starting_capital': data['starting_capital'].to_numpy()[first_rows].astype(float)
+    })
+
+def get_holdings_fingerprints(holdings: pd.DataFrame) -> pd.Series:
+    # Summing the row hashes makes each portfolio's fingerprint independent of row order
+    row_hashes = pd.util.hash_pandas_object(holdings, index = False).to_numpy()
+
+    return pd.Series(row_hashes).groupby(holdings['id'].to_numpy()).sum()
+
+class AUM_Snapshot_Store:
+    FILE_NAME = 'weekly_portfolio_AUMs.parquet'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(self.directory, AUM_Snapshot_Store.FILE_NAME)
+
+        os.makedirs(self.directory, exist_ok = True)
+
+        # One row per portfolio-week with the AUM and the running purchase cost needed to extend it,
+        # tagged with the fingerprint of the holdings it was computed from
+        self.snapshots = self.load()
+
+        # The single portfolio and total fund slides update the store from concurrent tasks
+        self.lock = threading.Lock()
+
+    def load(self) -> pd.DataFrame:
+        if not os.path.exists(self.path):
+            return pd.DataFrame({
+                'id': pd.Series(dtype = np.int64),
+                'date': pd.Series(dtype = 'datetime64[ns]'),
+                'AUM': pd.Series(dtype = float),
+                'cumulative_purchase_cost': pd.Series(dtype = float),
+                'holdings_fingerprint': pd.Series(dtype = np.uint64)
+            })
+
+        return pd.read_parquet(self.path)
+
+    def save(self) -> None:
+        # Write beside the store and swap it in, so an interrupted run never leaves a partial file
+        temporary_path = f'{self.path}.tmp'
+        self.snapshots.to_parquet(temporary_path, index = False)
+        os.replace(temporary_path, self.path)
+
+    def get_watermarks(self) -> pd.Series:
+        return self.snapshots.groupby('id')['date'].max()
+
+    def update(self, data: pd.DataFrame) -> pd.DataFrame:
+        # Aggregated query rows carry no holdings to fingerprint, so they are always computed in full
+        if 'market_value' in data.columns:
+            return compute_portfolio_AUMs(data)
+
+        with self.lock:
+            return self.update_snapshots(data)
+
+    def update_snapshots(self, data: pd.DataFrame) -> pd.DataFrame:
+        holdings = get_holdings(data)
+        fingerprints = get_holdings_fingerprints(holdings)
+        stored_fingerprints = self.snapshots.groupby('id')['holdings_fingerprint'].first()
+
+        # A portfolio whose holdings changed since its history was stored is recomputed from scratch
+        stored_fingerprints = stored_fingerprints[stored_fingerprints.index.isin(fingerprints.index)]
+        unchanged = stored_fingerprints.to_numpy() == fingerprints[stored_fingerprints.index].to_numpy()
+        unchanged_ids = stored_fingerprints.index[unchanged]
+
+        kept = self.snapshots[self.snapshots['id'].isin(unchanged_ids)]
+        watermarks = kept.groupby('id')['date'].max()
+        purchases_so_far = kept.groupby('id')['cumulative_purchase_cost'].last()
+
+        # Only weeks past a portfolio's watermark are computed, every week for portfolios without one
+        if len(watermarks):
+            dates = data['date'].to_numpy()
+
+            if not np.issubdtype(dates.dtype, np.datetime64):
+                dates = pd.to_datetime(data['date']).to_numpy()
+
+            # Cut to rows past the earliest watermark first, so the per-row checks below only see recent weeks
+            candidates = dates > watermarks.min().to_datetime64()
+
+            if len(watermarks) < len(fingerprints):
+                candidates |= ~data['id'].isin(watermarks.index).to_numpy()
+
+            new_data = data[candidates]
+            row_watermarks = new_data['id'].map(watermarks)
+            new_data = new_data[row_watermarks.isna() | (pd.to_datetime(new_data['date']) > row_watermarks)]
+
+            # Purchases land on the holding's purchase date, so holdings bought by the watermark are already paid for
+            purchased = pd.to_datetime(new_data['purchase_date']) <= row_watermarks[new_data.index]
+        else:
+            new_data = data
+            purchased = None
+
+        weekly_totals = compute_weekly_holdings_totals(new_data, ('id', 'date'), purchased)
+        weekly_totals['date'] = pd.to_datetime(weekly_totals['date'])
+
+        # Seed each portfolio's running purchase cost from its stored history before accumulating the new weeks
+        first_new_weeks = ~weekly_totals['id'].duplicated()
+        weekly_totals.loc[first_new_weeks, 'purchase_cost'] += weekly_totals.loc[first_new_weeks, 'id'].map(purchases_so_far).fillna(0)
+
+        starting_capitals = holdings.groupby('id')['starting_capital'].first()
+        cumulative_purchases = weekly_totals.groupby('id')['purchase_cost'].cumsum()
+        remaining_uninvested_capital = weekly_totals['id'].map(starting_capitals) - cumulative_purchases
+
+        new_snapshots = pd.DataFrame({
+            'id': weekly_totals['id'].to_numpy(dtype = np.int64),
+            'date': weekly_totals['date'].to_numpy(),
+            'AUM': (weekly_totals['market_value'] + remaining_uninvested_capital).round(2).to_numpy(),
+            'cumulative_purchase_cost': cumulative_purchases.to_numpy(),
+            'holdings_fingerprint': weekly_totals['id'].map(fingerprints).to_numpy(dtype = np.uint64)
+        })
+
+        replaced = self.snapshots['id'].isin(fingerprints.index) & ~self.snapshots['id'].isin(unchanged_ids)
+
+        if len(new_snapshots) or replaced.any():
+            retained = self.snapshots[~replaced]
+            self.snapshots = pd.concat([retained, new_snapshots], ignore_index = True) if len(retained) else new_snapshots
+            self.snapshots = self.snapshots.sort_values(['id', 'date'], ignore_index = True)
+            self.save()
+
+        portfolio_AUMs = self.snapshots.loc[self.snapshots['id'].isin(fingerprints.index), ['id', 'date', 'AUM']]
+        portfolio_AUMs = portfolio_AUMs.reset_index(drop = True)
+
+        # Hand dates back in the same form the data used, as the engine does without a store
+        if pd.api.types.is_datetime64_any_dtype(data['date']):
+            portfolio_AUMs['date'] = portfolio_AUMs['date'].astype(data['date'].dtype)
+        else:
+            portfolio_AUMs['date'] = portfolio_AUMs['date'].dt.date
+
+        return portfolio_AUMs
@@ -1,30 +1,36 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
 
-def build_all_stock_returns_scatter_chart(data: pd.DataFrame) -> px.scatter:
-    ticker_groups = data.groupby('id')
+from Chart_Builders.native_charts import Native_Scatter_Chart
+
+def compute_annualized_returns(data: pd.DataFrame) -> pd.DataFrame:
+    # The query returns no particular row order, so sort once and take each stock's first and last priced week
+    prices = data.dropna(subset = ['date', 'price']).sort_values(['id', 'date'], kind = 'stable')
 
-    # Key is the ticker, value will be a list with index 0 holding the ipo_date and index 1 holding the annualized return
-    returns = dict()
+    stocks = prices.groupby('id', sort = True).agg(ticker = ('ticker', 'first'),
+                                                   ipo_date = ('ipo_date', 'first'),
+                                                   first_price = ('price', 'first'),
+                                                   last_price = ('price', 'last'),
+                                                   first_date = ('date', 'first'),
+                                                   last_date = ('date', 'last'))
 
-    for id, group in ticker_groups:
-        ticker = group.iloc[0]['ticker']
-        ipo_date = group.iloc[0]['ipo_date']
+    num_days = (pd.to_datetime(stocks['last_date']) - pd.to_datetime(stocks['first_date'])).dt.days.to_numpy()
+    num_years = num_days / 365
 
-        first_price = group.iloc[0]['price']
-        last_price = group.iloc[1]['price']
+    # A stock priced on a single week has no period to annualize over
+    has_period = num_days > 0
+    stocks = stocks[has_period]
 
-        first_date = group.iloc[0]['date']
-        last_date = group.iloc[1]['date']
-        num_days = (last_date - first_date).days
-        num_years  = num_days / 365
+    growth = stocks['last_price'].to_numpy(dtype = float) / stocks['first_price'].to_numpy(dtype = float)
+    annualized_returns = np.round((growth ** (1 / num_years[has_period]) - 1) * 100, 2)
 
-        annualized_return = round(((last_price / first_price) ** (1 / num_years) - 1) * 100, 2)
+    return pd.DataFrame({'ipo_date': stocks['ipo_date'].to_numpy(),
+                         'annualized_return': annualized_returns,
+                         'ticker': stocks['ticker'].astype(str).to_numpy()})
 
-        returns[ticker] = [ipo_date, annualized_return]
-    
-    df = pd.DataFrame.from_dict(returns, orient = 'index', columns = ['ipo_date', 'annualized_return'])
-    df['ticker'] = df.index
+def build_all_stock_returns_scatter_chart(data: pd.DataFrame) -> px.scatter:
+    df = compute_annualized_returns(data)
 
     average = df['annualized_return'].mean()
 
@@ -52,4 +58,15 @@ def build_all_stock_returns_scatter_chart(data: pd.DataFrame) -> px.scatter:
         xanchor='left' 
     )
 
-    return figure
\ No newline at end of file
+    return figure
+
+def build_all_stock_returns_native_chart(data: pd.DataFrame) -> Native_Scatter_Chart:
+    df = compute_annualized_returns(data)
+
+    average = df['annualized_return'].mean()
+
+    return Native_Scatter_Chart('IPO Date vs Annualized Return of All Stocks',
+                                df['ipo_date'],
+                                df['annualized_return'],
+                                reference_value = average,
+                                reference_name = f'Average Return: {average:.2f}%')
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+class Chart_Image_Cache:
+    MAX_CACHE_BYTES = 256 * 1024 * 1024 # Oldest images are evicted once the cache grows past this size
+
+    def __init__(self, cache_directory: str, max_cache_bytes: int = MAX_CACHE_BYTES):
+        self.cache_directory = cache_directory
+        self.max_cache_bytes = max_cache_bytes
+
+        os.makedirs(self.cache_directory, exist_ok = True)
+
+    def get_key(self, figure_json: str) -> str:
+        # The serialized figure holds both its data and layout, so identical charts hash identically
+        return hashlib.sha256(figure_json.encode('utf-8')).hexdigest()
+
+    def get_cached_path(self, key: str) -> str:
+        return os.path.join(self.cache_directory, f'{key}.png')
+
+    def fetch(self, key: str, path: str) -> bool:
+        cached_path = self.get_cached_path(key)
+
+        if not os.path.exists(cached_path):
+            return False
+
+        try:
+            shutil.copyfile(cached_path, path)
+
+            # Touch the cached image so eviction treats it as recently used
+            os.utime(cached_path)
+        except FileNotFoundError:
+            # Evicted by another process sharing the cache since the check above
+            return False
+
+        return True
+
+    def store(self, key: str, path: str) -> None:
+        # Write beside the cached image and swap it in, so another process sharing the cache never copies a partial image.
+        # Each writer gets its own temporary file, which eviction skips since it is not a .png
+        file, temporary_path = tempfile.mkstemp(dir = self.cache_directory, suffix = '.tmp')
+        os.close(file)
+
+        try:
+            shutil.copyfile(path, temporary_path)
+            os.replace(temporary_path, self.get_cached_path(key))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        self.evict()
+
+    def evict(self) -> None:
+        # Batch deck workers share the cache, so an entry may be evicted by another process while this one scans it
+        entries = []
+
+        for file in os.listdir(self.cache_directory):
+            if not file.endswith('.png'):
+                continue
+
+            path = os.path.join(self.cache_directory, file)
+
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            entries.append((path, stat.st_mtime, stat.st_size))
+
+        entries.sort(key = lambda entry: entry[1])
+
+        total_bytes = sum(size for path, mtime, size in entries)
+
+        for path, mtime, size in entries:
+            if total_bytes <= self.max_cache_bytes:
+                break
+
+            total_bytes -= size
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
@@ -0,0 +1,113 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import threading
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from Chart_Builders.chart_image_cache import Chart_Image_Cache
+from Utilities.run_profiler import Run_Profiler, measure
+
+# Pools are started from the task graph's threads, and forking a multithreaded process can copy a lock some other
+# thread holds, so workers start from a fresh interpreter instead
+WORKER_CONTEXT = multiprocessing.get_context('spawn')
+
+def warm_up_renderer() -> None:
+    # Kaleido starts its headless browser on the first export, so each worker pays that cost once up front
+    pio.to_image(go.Figure(), format = 'png')
+
+def render_image(figure_json: str, path: str) -> str:
+    figure = pio.from_json(figure_json)
+    figure.write_image(path)
+
+    return path
+
+def render_measured_image(figure_json: str, path: str):
+    # Timed inside the worker, where the export actually runs
+    return measure(render_image, figure_json, path)
+
+class Chart_Renderer:
+    MAX_WORKERS = 4 # Each worker holds its own Kaleido browser, so keep the pool bounded
+
+    def __init__(self, max_workers: int = MAX_WORKERS, cache: Chart_Image_Cache = None, profiler: Run_Profiler = None):
+        self.max_workers = max_workers
+        self.executor = None
+        self.cache = cache
+
+        # Each export is recorded as a stage of the run profile when a profiler is given
+        self.profiler = profiler
+
+        # Key is the image path, value is the serialized figure waiting to be exported there
+        self.pending_figures = dict()
+
+        # Slides are computed and rendered from several threads at once
+        self.lock = threading.Lock()
+
+    def submit(self, figure: go.Figure, path: str) -> str:
+        figure_json = figure.to_json()
+
+        # An unchanged figure reuses its previously rendered image and never reaches Kaleido
+        if self.cache and self.cache.fetch(self.cache.get_key(figure_json), path):
+            print(f'Reused the cached image for {path}')
+            return path
+
+        with self.lock:
+            self.pending_figures[path] = figure_json
+
+        return path
+
+    def render(self, paths: list[str] = None) -> list[str]:
+        # Exports the pending figures for these paths, or every pending figure when None
+        with self.lock:
+            if paths is None:
+                paths = list(self.pending_figures)
+
+            figures = {path: self.pending_figures.pop(path) for path in paths if path in self.pending_figures}
+
+            # Workers are started on the first render and stay warm for any later ones
+            if figures and self.max_workers and not self.executor:
+                self.executor = ProcessPoolExecutor(max_workers = self.max_workers,
+                                                    mp_context = WORKER_CONTEXT,
+                                                    initializer = warm_up_renderer)
+
+        if not figures:
+            return []
+
+        print(f'Beginning to save {len(figures)} chart images')
+
+        # With no workers the images are exported in this process, as when the renderer already runs inside a worker
+        if not self.max_workers:
+            results = [render_measured_image(figure_json, path) for path, figure_json in figures.items()]
+        else:
+            futures = [self.executor.submit(render_measured_image, figure_json, path) for path, figure_json in figures.items()]
+            results = [future.result() for future in futures]
+
+        paths = [path for path, _ in results]
+
+        if self.profiler:
+            for path, timings in results:
+                self.profiler.record(f'write_image:{os.path.basename(path)}', **timings)
+
+        print('Successfully saved all chart images')
+
+        if self.cache:
+            for path, figure_json in figures.items():
+                self.cache.store(self.cache.get_key(figure_json), path)
+
+        return paths
+
+    def close(self) -> None:
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+
+def export_figure(figure: go.Figure, path: str, renderer: Chart_Renderer = None) -> str:
+    # Defer the export so the renderer can write every chart in parallel, or write it here when there is no renderer
+    if renderer:
+        return renderer.submit(figure, path)
+
+    print(f'Beginning to save the chart image {os.path.basename(path)}')
+    figure.write_image(path)
+    print('Successfully saved the image')
+
+    return path
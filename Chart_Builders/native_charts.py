@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from pptx.chart.data import CategoryChartData, XyChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_MARKER_STYLE
+from pptx.util import Pt
+
+EXCEL_EPOCH = pd.Timestamp('1899-12-30') # Day zero of Excel's date serial numbers, which scatter chart x values are stored as
+
+# Native charts are drawn by PowerPoint from their own data, so no image is exported and the chart stays editable.
+# Each class holds the series a chart builder computed and draws them when the deck is assembled.
+
+def set_chart_title(chart, title: str) -> None:
+    chart.has_title = True
+    chart.chart_title.text_frame.text = title
+    chart.chart_title.text_frame.paragraphs[0].font.size = Pt(16)
+
+class Native_Line_Chart:
+    def __init__(self, title: str, dates, series: dict, number_format: str = '$#,##0'):
+        self.title = title
+        self.dates = pd.to_datetime(pd.Series(dates)).dt.date.tolist()
+
+        # Key is the series name, value is its values in date order
+        self.series = {name: np.asarray(values, dtype = float) for name, values in series.items()}
+        self.number_format = number_format
+
+    def add_to(self, slide, left: int, top: int, width: int, height: int):
+        chart_data = CategoryChartData(number_format = self.number_format)
+
+        # Date categories give the chart a date axis instead of one label per week
+        chart_data.categories = self.dates
+
+        for name, values in self.series.items():
+            chart_data.add_series(name, values.tolist())
+
+        chart = slide.shapes.add_chart(XL_CHART_TYPE.LINE, left, top, width, height, chart_data).chart
+        set_chart_title(chart, self.title)
+
+        chart.has_legend = True
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+
+        chart.category_axis.tick_labels.number_format = 'yyyy'
+        chart.category_axis.tick_labels.number_format_is_linked = False
+        chart.value_axis.tick_labels.number_format = self.number_format
+        chart.value_axis.tick_labels.number_format_is_linked = False
+
+        # Thousands of weekly points read as a line, markers would only clutter it
+        for plot_series in chart.plots[0].series:
+            plot_series.smooth = False
+            plot_series.marker.style = XL_MARKER_STYLE.NONE
+            plot_series.format.line.width = Pt(1.5)
+
+        return chart
+
+class Native_Bar_Chart:
+    def __init__(self, title: str, categories: list, values: list, number_format: str = '#,##0', colors: list = None):
+        self.title = title
+        self.categories = list(categories)
+        self.values = [float(value) for value in values]
+        self.number_format = number_format
+
+        # One RGBColor per bar, or None for the theme's default fill
+        self.colors = colors
+
+    def add_to(self, slide, left: int, top: int, width: int, height: int):
+        chart_data = CategoryChartData(number_format = self.number_format)
+        chart_data.categories = self.categories
+        chart_data.add_series(self.title, self.values)
+
+        chart = slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, left, top, width, height, chart_data).chart
+        set_chart_title(chart, self.title)
+        chart.has_legend = False
+
+        plot = chart.plots[0]
+        plot.has_data_labels = True
+        plot.data_labels.number_format = self.number_format
+        plot.data_labels.number_format_is_linked = False
+
+        chart.value_axis.tick_labels.number_format = self.number_format
+        chart.value_axis.tick_labels.number_format_is_linked = False
+
+        if self.colors:
+            for point, color in zip(plot.series[0].points, self.colors):
+                point.format.fill.solid()
+                point.format.fill.fore_color.rgb = color
+
+        return chart
+
+class Native_Scatter_Chart:
+    def __init__(self, title: str, dates, values, reference_value: float = None, reference_name: str = None, number_format: str = '0.00'):
+        self.title = title
+
+        # Scatter charts only plot numbers, so dates are stored as Excel serial days and formatted back as years
+        self.x_values = ((pd.to_datetime(pd.Series(dates)) - EXCEL_EPOCH).dt.days).to_numpy(dtype = float)
+        self.y_values = np.asarray(values, dtype = float)
+
+        # Optional horizontal line across the plotted dates, such as an average
+        self.reference_value = reference_value
+        self.reference_name = reference_name
+        self.number_format = number_format
+
+    def add_to(self, slide, left: int, top: int, width: int, height: int):
+        chart_data = XyChartData()
+
+        points = chart_data.add_series(self.title, number_format = self.number_format)
+        for x, y in zip(self.x_values.tolist(), self.y_values.tolist()):
+            points.add_data_point(x, y)
+
+        if self.reference_value is not None:
+            reference = chart_data.add_series(self.reference_name, number_format = self.number_format)
+            reference.add_data_point(self.x_values.min(), self.reference_value)
+            reference.add_data_point(self.x_values.max(), self.reference_value)
+
+        chart = slide.shapes.add_chart(XL_CHART_TYPE.XY_SCATTER, left, top, width, height, chart_data).chart
+        set_chart_title(chart, self.title)
+        chart.has_legend = self.reference_value is not None
+
+        if chart.has_legend:
+            chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+            chart.legend.include_in_layout = False
+
+        chart.category_axis.tick_labels.number_format = 'yyyy'
+        chart.category_axis.tick_labels.number_format_is_linked = False
+
+        plot_series = chart.plots[0].series
+        plot_series[0].marker.style = XL_MARKER_STYLE.CIRCLE
+        plot_series[0].marker.size = 4
+
+        # The reference series is drawn as a plain red line between its two end points
+        if self.reference_value is not None:
+            plot_series[1].marker.style = XL_MARKER_STYLE.NONE
+            plot_series[1].format.line.fill.solid()
+            plot_series[1].format.line.fill.fore_color.rgb = RGBColor(255, 0, 0)
+
+        return chart
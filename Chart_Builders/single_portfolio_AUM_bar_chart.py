@@ -1,4 +1,7 @@
 import plotly.graph_objects as go
+from pptx.dml.color import RGBColor
+
+from Chart_Builders.native_charts import Native_Bar_Chart
 
 def build_single_portfolio_AUM_bar_chart(portfolio_value: float, benchmark_value: float, name: str, id_num: str) -> go.Figure:
     categories = ['Portfolio Value', 'Benchmark Value']
@@ -32,4 +35,11 @@ def build_single_portfolio_AUM_bar_chart(portfolio_value: float, benchmark_value
         height = 400
     )
 
-    return figure
\ No newline at end of file
+    return figure
+
+def build_single_portfolio_AUM_native_bar_chart(portfolio_value: float, benchmark_value: float, name: str, id_num: str) -> Native_Bar_Chart:
+    return Native_Bar_Chart(f'Portfolio {name} (ID #{id_num}) Current AUM vs. Benchmark',
+                            ['Portfolio Value', 'Benchmark Value'],
+                            [portfolio_value, benchmark_value],
+                            number_format = '$#,##0',
+                            colors = [RGBColor(0, 0, 255), RGBColor(211, 211, 211)]) # blue and lightgrey, as in the Plotly chart
@@ -1,55 +1,18 @@
 import pandas as pd
 import plotly.express as px
 
-def build_single_portfolio_AUM_line_chart(benchmark_series: list[int], data: pd.DataFrame) -> px.line:    
+from Chart_Builders.AUM_engine import compute_single_portfolio_AUM
+from Chart_Builders.native_charts import Native_Line_Chart
+
+def build_single_portfolio_AUM_line_chart(benchmark_series: list[int], data: pd.DataFrame, snapshot_store = None) -> px.line:    
     # Get portfolio ID
     portfolio_id = data.loc[0, 'id']
 
     # Get portfolio name
     portfolio_name = data.loc[0, 'name']
     
-    # Initialize a variable to hold the remaining starting capital
-    remaining_uninvested_capital = data.loc[0, 'starting_capital']
-
-    # Initialize another variable to calculate the benchmark data off
-    starting_capital = data.loc[0, 'starting_capital']
-
-    # Initialize a set to hold the stocks already seen and purchased
-    stocks_purchased = set()
-
-    # Initialize lists to carry the dates, portfolio AUMs, and benchmark AUMs for each date
-    dates = []
-    AUMs_per_date = []
-    benchmark_AUMs = []
-
-    # Group the df by date
-    date_groups = data.groupby('date')
-
-    benchmark_counter = 0
-    for date, group in date_groups:
-        group_total_AUM = 0
-
-        for index, row in group.iterrows():
-            current_stock_id = row['stock_id']
-            current_stock_value = row['price'] * row['shares_purchased']
-
-            if current_stock_id not in stocks_purchased:
-                remaining_uninvested_capital -= current_stock_value # Subtracting from uninvested capital because the current stock was just purchased this week
-                stocks_purchased.add(current_stock_id)
-            
-            group_total_AUM += current_stock_value
-
-        group_total_AUM += remaining_uninvested_capital
-        group_total_AUM = round(group_total_AUM, 2)
-        
-        dates.append(date)
-        AUMs_per_date.append(group_total_AUM)
-
-        benchmark_value = starting_capital * benchmark_series[benchmark_counter]
-        benchmark_AUMs.append(benchmark_value)
-        benchmark_counter += 1
-
-    df_AUM = pd.DataFrame({'Date': dates, 'Portfolio AUM': AUMs_per_date, 'Benchmark AUM': benchmark_AUMs})
+    # Compute the weekly portfolio and benchmark AUMs with the columnar engine
+    df_AUM = compute_single_portfolio_AUM(benchmark_series, data, snapshot_store)
 
     figure = px.line(df_AUM, x = 'Date', y = ['Portfolio AUM', 'Benchmark AUM'],
                      labels = {'value': 'AUM', 'variable': 'Series'},
@@ -64,4 +27,15 @@ def build_single_portfolio_AUM_line_chart(benchmark_series: list[int], data: pd.
         )
     )
 
-    return figure
\ No newline at end of file
+    return figure
+
+def build_single_portfolio_AUM_native_chart(benchmark_series: list[int], data: pd.DataFrame, snapshot_store = None) -> Native_Line_Chart:
+    portfolio_id = data.loc[0, 'id']
+    portfolio_name = data.loc[0, 'name']
+
+    # Same weekly series as the Plotly chart, drawn by PowerPoint instead of exported as an image
+    df_AUM = compute_single_portfolio_AUM(benchmark_series, data, snapshot_store)
+
+    return Native_Line_Chart(f'Portfolio {portfolio_name} (ID #{portfolio_id}) AUM vs. Benchmark',
+                             df_AUM['Date'],
+                             {'Portfolio AUM': df_AUM['Portfolio AUM'], 'Benchmark AUM': df_AUM['Benchmark AUM']})
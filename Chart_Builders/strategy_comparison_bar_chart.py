@@ -1,6 +1,8 @@
 import pandas as pd
 import plotly.express as px
 
+from Chart_Builders.native_charts import Native_Bar_Chart
+
 def build_strategy_comparison_chart(data: pd.DataFrame) -> px.bar:
     chart_title = 'Comparison of Different Portfolio Strategies'
 
@@ -8,4 +10,11 @@ def build_strategy_comparison_chart(data: pd.DataFrame) -> px.bar:
 
     figure = px.bar(data, x = 'Strategy', y = 'Total', title = chart_title)
 
-    return figure
\ No newline at end of file
+    return figure
+
+def build_strategy_comparison_native_chart(data: pd.DataFrame) -> Native_Bar_Chart:
+    chart_title = 'Comparison of Different Portfolio Strategies'
+
+    data = data.rename(columns = {'strategy': 'Strategy', 'total': 'Total'})
+
+    return Native_Bar_Chart(chart_title, data['Strategy'].tolist(), data['Total'].tolist())
@@ -0,0 +1,49 @@
+import csv
+import io
+from itertools import islice
+import psycopg2
+from psycopg2 import errorcodes
+from psycopg2.extras import execute_values
+
+DEFAULT_BATCH_SIZE = 50000 # Rows sent to postgresql per round trip, each batch is committed on its own
+
+# Errors from databases and poolers that reject COPY, anything else is a real failure of the load
+COPY_UNSUPPORTED_CODES = {errorcodes.FEATURE_NOT_SUPPORTED, errorcodes.INSUFFICIENT_PRIVILEGE}
+
+def batched(rows, batch_size):
+    # Rows can be a generator that produces them lazily, since only one batch of tuples is ever held at a time
+    rows = iter(rows)
+
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+def copy_batch(cur, table, columns, batch):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator = '\n').writerows(batch)
+    buffer.seek(0)
+
+    cur.copy_expert(f'COPY {table} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+def insert_batch(cur, table, columns, batch):
+    execute_values(cur, f'INSERT INTO {table} ({", ".join(columns)}) VALUES %s', batch, page_size = len(batch))
+
+def bulk_load(connection, table, columns, rows, batch_size = DEFAULT_BATCH_SIZE, use_copy = True):
+    with connection.cursor() as cur:
+        for batch_num, batch in enumerate(batched(rows, batch_size)):
+            if use_copy:
+                try:
+                    copy_batch(cur, table, columns, batch)
+                except psycopg2.Error as error:
+                    if error.pgcode not in COPY_UNSUPPORTED_CODES:
+                        raise
+
+                    # Some hosted databases and poolers reject COPY, so fall back to multi-row inserts
+                    print(f'COPY into {table} failed ({error}), falling back to batched inserts')
+                    connection.rollback()
+                    use_copy = False
+
+            if not use_copy:
+                insert_batch(cur, table, columns, batch)
+
+            connection.commit()
+            print(f'Loaded batch #{batch_num + 1} of {len(batch)} rows into {table}')
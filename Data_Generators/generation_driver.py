@@ -0,0 +1,217 @@
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import psycopg2
+from dotenv import load_dotenv
+
+from Data_Generators import stock_generator
+from Data_Generators import stock_prices_generator
+from Data_Generators import portfolio_manager_generator
+from Data_Generators import portfolios_generator
+from Data_Generators import portfolio_holdings_generator
+from Data_Generators.bulk_loader import bulk_load, DEFAULT_BATCH_SIZE
+from Utilities.trading_calendar import find_first_friday
+
+load_dotenv()
+
+# Partition sizes are fixed so the partitions, and therefore their seeds, never depend on the worker count
+STOCKS_PER_PARTITION = 250
+PORTFOLIOS_PER_PARTITION = 50
+
+# Each kind of partition draws from its own branch of the master seed
+STOCKS_SEED_KEY = 0
+PORTFOLIOS_SEED_KEY = 1
+MANAGERS_SEED_KEY = 2
+MERGE_SEED_KEY = 3
+
+PARQUET_ROW_GROUP_SIZE = 100000
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'.upper()
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Generate the fund dataset in parallel with reproducible seeds')
+    parser.add_argument('--num-stocks', type = int, default = 1000)
+    parser.add_argument('--num-portfolios', type = int, default = 200)
+    parser.add_argument('--num-managers', type = int, default = 100)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--workers', type = int, default = os.cpu_count())
+    parser.add_argument('--load', action = 'store_true', help = 'Load the generated tables into postgresql')
+    parser.add_argument('--parquet-directory', help = 'Also write each generated table to <directory>/<table>.parquet')
+    args = parser.parse_args()
+
+    tables = generate_all_tables(args.num_stocks, args.num_portfolios, args.num_managers, args.seed, args.workers)
+
+    for table_name, table in tables.items():
+        print(f'Generated {len(table):,} rows for {table_name}')
+
+    if args.parquet_directory:
+        write_parquet(tables, args.parquet_directory)
+
+    if args.load:
+        batch_size = int(os.getenv('LOAD_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+        load_into_postgresql(tables, os.getenv('DB_NAME'), os.getenv('USER'), os.getenv('PASSWORD'), os.getenv('HOST'), os.getenv('PORT'), batch_size)
+
+def seed_partition(master_seed, *spawn_key):
+    seed_sequence = np.random.SeedSequence(master_seed, spawn_key = spawn_key)
+
+    # The existing generators draw from the global random module, so seed it for this partition as well
+    random.seed(int(seed_sequence.generate_state(1)[0]))
+
+    return np.random.default_rng(seed_sequence)
+
+def generate_stocks_partition(master_seed, partition, first_id, amount):
+    rng = seed_partition(master_seed, STOCKS_SEED_KEY, partition)
+
+    # get_tickers returns a set's iteration order, which changes with each process's hash seed
+    tickers = rng.permutation(sorted(stock_generator.get_tickers(amount)))
+
+    stocks = pd.DataFrame({
+        'id': np.arange(first_id, first_id + amount),
+        'ticker': tickers,
+        'ipo_date': pd.to_datetime(stock_generator.get_dates(amount)),
+        'shares_outstanding': stock_generator.get_shares_outstanding(amount),
+        'continent': stock_generator.get_continents(amount)
+    })
+
+    ipo_prices = stock_prices_generator.generate_all_ipo_prices(stocks['shares_outstanding'].tolist(), rng)
+    stock_prices = stock_prices_generator.generate_all_following_prices(stocks['id'].to_numpy(),
+                                                                         stocks['ipo_date'].to_numpy(),
+                                                                         np.array(ipo_prices),
+                                                                         rng)
+
+    return stocks, stock_prices
+
+def generate_portfolios_partition(master_seed, partition, amount, pm_ids, stock_ids):
+    seed_partition(master_seed, PORTFOLIOS_SEED_KEY, partition)
+
+    pm_assignments = portfolios_generator.assign_all_portfolio_managers(pm_ids, amount)
+
+    portfolios = pd.DataFrame({
+        'name': portfolios_generator.generate_portfolio_names(amount),
+        'year_established': portfolios_generator.generate_years_established(amount),
+        'starting_capital': portfolios_generator.generate_starting_capitals(amount),
+        'strategy': portfolios_generator.generate_strategies(amount),
+        'primary_pm_id': pm_assignments[0],
+        'secondary_pm_id': pm_assignments[1],
+        'tertiary_pm_id': pm_assignments[2]
+    })
+
+    stock_purchases = portfolio_holdings_generator.generate_all_stocks_purchased(stock_ids, amount)
+
+    return portfolios, stock_purchases
+
+def generate_portfolio_managers(master_seed, amount):
+    seed_partition(master_seed, MANAGERS_SEED_KEY)
+
+    people = portfolio_manager_generator.generate_random_entries(amount)
+    portfolio_managers = pd.DataFrame(people, columns = ['name', 'year_joined', 'city', 'yoe', 'uni_major'])
+    portfolio_managers.insert(0, 'id', np.arange(1, amount + 1))
+
+    return portfolio_managers
+
+def get_partitions(amount, partition_size):
+    return [(start, min(partition_size, amount - start)) for start in range(0, amount, partition_size)]
+
+def make_tickers_unique(tickers, rng):
+    # Tickers are only unique within a partition, so redraw any that collide across partitions
+    tickers = tickers.copy()
+    duplicated = tickers.duplicated()
+
+    while duplicated.any():
+        tickers[duplicated] = [''.join(rng.choice(list(ALPHABET), 4)) for i in range(duplicated.sum())]
+        duplicated = tickers.duplicated()
+
+    return tickers
+
+def generate_all_tables(num_stocks, num_portfolios, num_managers, master_seed = 0, workers = None):
+    portfolio_managers = generate_portfolio_managers(master_seed, num_managers)
+    pm_ids = portfolio_managers['id'].tolist()
+    stock_ids = list(range(1, num_stocks + 1))
+
+    stock_partitions = get_partitions(num_stocks, STOCKS_PER_PARTITION)
+    portfolio_partitions = get_partitions(num_portfolios, PORTFOLIOS_PER_PARTITION)
+
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        stock_futures = [executor.submit(generate_stocks_partition, master_seed, partition, start + 1, amount)
+                         for partition, (start, amount) in enumerate(stock_partitions)]
+        portfolio_futures = [executor.submit(generate_portfolios_partition, master_seed, partition, amount, pm_ids, stock_ids)
+                             for partition, (start, amount) in enumerate(portfolio_partitions)]
+
+        # Partitions are merged in partition order, whichever worker finished them first
+        stock_results = [future.result() for future in stock_futures]
+        portfolio_results = [future.result() for future in portfolio_futures]
+
+    merge_rng = seed_partition(master_seed, MERGE_SEED_KEY)
+
+    stocks = pd.concat([result[0] for result in stock_results], ignore_index = True)
+    stocks['ticker'] = make_tickers_unique(stocks['ticker'], merge_rng)
+
+    stock_prices = pd.concat([result[1] for result in stock_results], ignore_index = True)
+    stock_prices = stock_prices.rename(columns = {'id': 'stock_id', 'days': 'date', 'prices': 'price'})[['stock_id', 'date', 'price']]
+
+    portfolios = pd.concat([result[0] for result in portfolio_results], ignore_index = True)
+    portfolios.insert(0, 'id', np.arange(1, len(portfolios) + 1))
+    stock_purchases = [purchases for result in portfolio_results for purchases in result[1]]
+
+    portfolio_holdings = create_portfolio_holdings(portfolios, stock_prices, stock_purchases)
+
+    return {
+        'portfolio_managers': portfolio_managers,
+        'stocks': stocks,
+        'stock_prices': stock_prices,
+        'portfolios': portfolios,
+        'portfolio_holdings': portfolio_holdings
+    }
+
+def create_portfolio_holdings(portfolios, stock_prices, stock_purchases):
+    # create_transactions expects the python dates postgresql returns
+    stocks_df = pd.DataFrame({'id': stock_prices['stock_id'], 'date': stock_prices['date'].dt.date, 'price': stock_prices['price']})
+    first_date_map = stocks_df.groupby('id')['date'].min().to_dict()
+
+    days_established = portfolios['year_established'].apply(find_first_friday).tolist()
+
+    return portfolio_holdings_generator.create_transactions(first_date_map,
+                                                            portfolios['id'].tolist(),
+                                                            portfolios['starting_capital'].tolist(),
+                                                            days_established,
+                                                            stocks_df,
+                                                            stock_purchases)
+
+def write_parquet(tables, directory):
+    os.makedirs(directory, exist_ok = True)
+
+    for table_name, table in tables.items():
+        path = os.path.join(directory, f'{table_name}.parquet')
+
+        # Small row groups let filters on the sorted stock and portfolio ids skip most of each file
+        table.to_parquet(path, index = False, row_group_size = PARQUET_ROW_GROUP_SIZE)
+        print(f'Wrote {table_name} to {path}')
+
+def load_into_postgresql(tables, dbname, user, password, host, port, batch_size = DEFAULT_BATCH_SIZE):
+    params = {
+        'dbname': dbname,
+        'user': user,
+        'password': password,
+        'host': host,
+        'port': port
+    }
+    connection = psycopg2.connect(**params)
+
+    # Tables are loaded in dependency order without their id columns; they are expected to be empty
+    # so the serial ids postgresql assigns match the ids generated here
+    for table_name, table in tables.items():
+        columns = [column for column in table.columns if column != 'id']
+        rows = table[columns].itertuples(index = False, name = None)
+
+        print(f'Beginning loading {table_name}')
+        bulk_load(connection, table_name, columns, rows, batch_size)
+
+    connection.close()
+
+    print('Loading of all tables complete')
+
+if __name__ == '__main__':
+    main()
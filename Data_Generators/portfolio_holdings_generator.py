@@ -1,14 +1,19 @@
 from sqlalchemy import create_engine
 import pandas as pd
 import random
-from datetime import datetime, timedelta
-import math
+import numpy as np
 import psycopg2
 import os
 from dotenv import load_dotenv
 
+from Data_Generators.bulk_loader import bulk_load, DEFAULT_BATCH_SIZE
+from Utilities.trading_calendar import find_first_friday
+
 load_dotenv()
 
+# Columns of the portfolio_holdings table, in the order create_sql_tuples yields them and insert_rows loads them
+COLUMNS = ['portfolio_id', 'stock_id', 'shares', 'date']
+
 def main():
     authentication = os.getenv('DATABASE_URL')
     db_name = os.getenv('DB_NAME')
@@ -16,6 +21,7 @@ def main():
     password = os.getenv('PASSWORD')
     host = os.getenv('HOST')
     port = os.getenv('PORT')
+    batch_size = int(os.getenv('LOAD_BATCH_SIZE', DEFAULT_BATCH_SIZE))
 
     engine = create_engine(authentication)
 
@@ -25,7 +31,7 @@ def main():
     '''
 
     portfolios_df = pd.read_sql(portfolios_query, engine)
-    portfolios_df['day_established'] = portfolios_df['year_established'].apply(get_first_friday)
+    portfolios_df['day_established'] = portfolios_df['year_established'].apply(find_first_friday)
 
     stocks_query = '''
         SELECT s.id, s.shares_outstanding, s.ipo_date, p.price, p.date
@@ -69,7 +75,7 @@ def main():
     transactions = create_transactions(first_date_map, portfolio_ids, portfolio_starting_capitals, portfolio_days_established, stocks_df, stock_purchases)
     
     print('Beginning loading into database')
-    load_into_postgresql(transactions, db_name, user, password, host, port)
+    load_into_postgresql(transactions, db_name, user, password, host, port, batch_size)
     print('Loading into database was successful')
 
 def generate_num_different_stocks_purchased():
@@ -96,48 +102,31 @@ def generate_all_stocks_purchased(stock_ids, amount = 200):
 def create_first_date_map(stocks_df):
     return stocks_df.set_index('stock_id')['date'].to_dict()
 
-def get_first_friday(year):
-    first_day = datetime(year, 1, 1)
-    days_to_friday = (4 - first_day.weekday()) % 7
-    return first_day + timedelta(days = days_to_friday)
-
 def create_transactions(first_date_map, portfolio_ids, portfolio_starting_capitals, portfolio_days_established, stocks_df, stock_purchases):
-    df_portfolio_id = []
-    df_stock_id = []
-    df_shares = []
-    df_date = []
-
-    for i in range(len(portfolio_ids)):
-        print(f'Starting on portfolio #{i + 1}')
-        
-        current_portfolio_id = portfolio_ids[i]
-        current_portfolio_day_established = portfolio_days_established[i].date()
-        current_portfolio_purchases = stock_purchases[i]
-        num_purchases = len(current_portfolio_purchases)
-        current_starting_capital = portfolio_starting_capitals[i]
-        max_investment_per_stock = current_starting_capital / num_purchases
-
-        for stock in current_portfolio_purchases:
-            first_price_date = first_date_map[stock]
-            purchase_date = first_price_date if first_price_date > current_portfolio_day_established else current_portfolio_day_established
-            price_on_purchase_date = stocks_df.loc[(stocks_df['id'] == stock) & (stocks_df['date'] == purchase_date), 'price'].iat[0]
-            shares_purchased = math.floor(max_investment_per_stock / price_on_purchase_date)
-
-            df_portfolio_id.append(current_portfolio_id)
-            df_stock_id.append(stock)
-            df_shares.append(shares_purchased)
-            df_date.append(purchase_date)
-
-        df = {
-            'portfolio_id': df_portfolio_id,
-            'stock_id': df_stock_id,
-            'shares': df_shares,
-            'date': df_date
-        }
-
-    return pd.DataFrame(df)
-
-def load_into_postgresql(table, dbname, user, password, host, port):
+    num_purchases = np.array([len(purchases) for purchases in stock_purchases])
+    max_investments_per_stock = np.array(portfolio_starting_capitals) / num_purchases
+
+    # One row per purchase across every portfolio
+    transactions = pd.DataFrame({
+        'portfolio_id': np.repeat(portfolio_ids, num_purchases),
+        'stock_id': np.concatenate(stock_purchases),
+        'day_established': np.repeat([day.date() for day in portfolio_days_established], num_purchases),
+        'max_investment_per_stock': np.repeat(max_investments_per_stock, num_purchases)
+    })
+
+    # A stock is bought on the later of its first price date and the day its portfolio was established
+    first_price_dates = transactions['stock_id'].map(first_date_map)
+    transactions['date'] = first_price_dates.where(first_price_dates > transactions['day_established'], transactions['day_established'])
+
+    # A single merge against the price table replaces a full scan of it for every purchase
+    prices = stocks_df[['id', 'date', 'price']].rename(columns = {'id': 'stock_id'}).drop_duplicates(['stock_id', 'date'])
+    transactions = transactions.merge(prices, on = ['stock_id', 'date'], how = 'left')
+
+    transactions['shares'] = np.floor(transactions['max_investment_per_stock'] / transactions['price']).astype(int)
+
+    return transactions[['portfolio_id', 'stock_id', 'shares', 'date']]
+
+def load_into_postgresql(table, dbname, user, password, host, port, batch_size = DEFAULT_BATCH_SIZE):
     params = {
         'dbname': dbname,
         'user': user,
@@ -150,28 +139,16 @@ def load_into_postgresql(table, dbname, user, password, host, port):
 
     print('Beginning row insertion')
     
-    insert_rows(connection, rows)
+    insert_rows(connection, rows, batch_size)
     connection.close()
 
     print('Loading of all rows complete')
 
 def create_sql_tuples(table):
-    tuples = []
+    yield from table[COLUMNS].itertuples(index = False, name = None)
 
-    for index, row in table.iterrows():
-        current_tuple = (row['portfolio_id'], row['stock_id'], row['shares'], row['date'])
-        tuples.append(current_tuple)
-    
-    return tuples
-
-def insert_rows(connection, rows):
-    with connection.cursor() as cur:
-        insert_query = '''
-        INSERT INTO portfolio_holdings (portfolio_id, stock_id, shares, date)
-        VALUES (%s, %s, %s, %s);
-        '''
-        for row in rows:
-            cur.execute(insert_query, row)
-        connection.commit()
-
-main()
\ No newline at end of file
+def insert_rows(connection, rows, batch_size = DEFAULT_BATCH_SIZE):
+    bulk_load(connection, 'portfolio_holdings', COLUMNS, rows, batch_size)
+
+if __name__ == '__main__':
+    main()
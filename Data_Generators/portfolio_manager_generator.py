@@ -43,7 +43,11 @@ def create_sql_insert(people):
     
     return string + ', '.join(string_lst)
 
-people = generate_random_entries(100)
-test = create_sql_insert(people)
+def main():
+    people = generate_random_entries(100)
+    test = create_sql_insert(people)
 
-print(test)
\ No newline at end of file
+    print(test)
+
+if __name__ == '__main__':
+    main()
@@ -6,8 +6,13 @@ import psycopg2
 import os
 from dotenv import load_dotenv
 
+from Data_Generators.bulk_loader import bulk_load, DEFAULT_BATCH_SIZE
+
 load_dotenv()
 
+# Columns of the portfolios table, in the order create_sql_tuples yields them and insert_rows loads them
+COLUMNS = ['name', 'year_established', 'starting_capital', 'strategy', 'primary_pm_id', 'secondary_pm_id', 'tertiary_pm_id']
+
 def main():
     authentication = os.getenv('DATABASE_URL')
     db_name = os.getenv('DB_NAME')
@@ -15,6 +20,7 @@ def main():
     password = os.getenv('PASSWORD')
     host = os.getenv('HOST')
     port = os.getenv('PORT')
+    batch_size = int(os.getenv('LOAD_BATCH_SIZE', DEFAULT_BATCH_SIZE))
 
     engine = create_engine(authentication)
 
@@ -50,7 +56,7 @@ def main():
 
     print('Successfully generated all data, beginning loading into postgresql')
 
-    load_into_postgresql(portfolios_table, db_name, user, password, host, port)
+    load_into_postgresql(portfolios_table, db_name, user, password, host, port, batch_size)
 
     print('Successfully updated postgresql')
 
@@ -130,7 +136,7 @@ def assign_all_portfolio_managers(pm_ids, amount = 200):
     
     return [final_primary_pms, final_secondary_pms, final_tertiary_pms]
 
-def load_into_postgresql(table, dbname, user, password, host, port):
+def load_into_postgresql(table, dbname, user, password, host, port, batch_size = DEFAULT_BATCH_SIZE):
     params = {
         'dbname': dbname,
         'user': user,
@@ -143,30 +149,16 @@ def load_into_postgresql(table, dbname, user, password, host, port):
 
     print('Beginning row insertion')
     
-    insert_rows(connection, rows)
+    insert_rows(connection, rows, batch_size)
     connection.close()
 
     print('Loading of all rows complete')
 
 def create_sql_tuples(table):
-    tuples = []
+    yield from table[COLUMNS].itertuples(index = False, name = None)
 
-    for index, row in table.iterrows():
-        current_tuple = (row['name'], row['year_established'], row['starting_capital'], row['strategy'],
-                         row['primary_pm_id'], row['secondary_pm_id'], row['tertiary_pm_id'])
-        tuples.append(current_tuple)
-    
-    return tuples
-
-def insert_rows(connection, rows):
-    with connection.cursor() as cur:
-        insert_query = '''
-        INSERT INTO portfolios (name, year_established, starting_capital, strategy, primary_pm_id, secondary_pm_id, tertiary_pm_id)
-        VALUES (%s, %s, %s, %s, %s, %s, %s);
-        '''
-        for row in rows:
-            cur.execute(insert_query, row)
-        connection.commit()
+def insert_rows(connection, rows, batch_size = DEFAULT_BATCH_SIZE):
+    bulk_load(connection, 'portfolios', COLUMNS, rows, batch_size)
 
 def test_assign_all_portfolio_managers(pm_ids):
     for i in range(1000):
@@ -181,4 +173,5 @@ def test_assign_all_portfolio_managers(pm_ids):
     
     print('Tests passed, no duplicate found')
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -92,4 +92,5 @@ def create_sql_insert(tickers, ipo_dates, shares_outstanding_totals, continents)
     
     return string + ', '.join(string_lst)
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,18 @@
-import random
 import pandas as pd
 import numpy as np
-import datetime
 from sqlalchemy import create_engine 
 import psycopg2
 import os
 from dotenv import load_dotenv
 
+from Data_Generators.bulk_loader import bulk_load, DEFAULT_BATCH_SIZE
+from Utilities.trading_calendar import FUND_LAST_DAY, find_next_friday, count_weeks_through
+
 load_dotenv()
 
+PRICE_CHANGES = 1 + np.arange(-2.0, 2.5, 0.2) / 100 # Weekly moves from -2% to +2.4% in 0.2% steps
+STOCKS_PER_BLOCK = 10000 # Bounds the stock x week change matrix drawn at once
+
 def main():
     authentication = os.getenv('DATABASE_URL')
     db_name = os.getenv('DB_NAME')
@@ -16,6 +20,7 @@ def main():
     password = os.getenv('PASSWORD')
     host = os.getenv('HOST')
     port = os.getenv('PORT')
+    batch_size = int(os.getenv('LOAD_BATCH_SIZE', DEFAULT_BATCH_SIZE))
 
     engine = create_engine(authentication)
 
@@ -28,31 +33,22 @@ def main():
 
     shares_outstanding = df['shares_outstanding'].tolist()
 
-    ipo_prices = generate_all_ipo_prices(shares_outstanding)
+    # Seeding makes the generated prices reproducible between runs, IPO prices included
+    seed = os.getenv('GENERATOR_SEED')
+    rng = np.random.default_rng(int(seed) if seed else None)
 
-    ids = df['id'].tolist()
-    ipo_dates = df['ipo_date'].tolist()
-    stocks_info = zip(ids, ipo_dates, ipo_prices)
-    stocks_info = {info[0]: [info[1], info[2]] for info in stocks_info}
-
-    price_tables = generate_all_following_prices(stocks_info)
-    
-    results = add_all_ids(price_tables)
-    all_dfs = []
+    ipo_prices = generate_all_ipo_prices(shares_outstanding, rng)
 
-    for df in results.values():
-        all_dfs.append(df)
+    table = generate_all_following_prices(df['id'].to_numpy(), df['ipo_date'].to_numpy(), np.array(ipo_prices), rng)
     
-    table = pd.concat(all_dfs, ignore_index = True)
-    
-    load_into_postgresql(table, db_name, user, password, host, port)
+    load_into_postgresql(table, db_name, user, password, host, port, batch_size)
 
-def generate_ipo_price(shares_outstanding):
+def generate_ipo_price(shares_outstanding, rng):
     max_market_cap = 250000000
     min_market_cap = 10000000
     min_percentage = min_market_cap / max_market_cap
 
-    percentage = random.random()
+    percentage = rng.random()
     percentage = percentage if percentage >= min_percentage else min_percentage
 
     rounded_percentage = round(percentage, 8)
@@ -63,77 +59,53 @@ def generate_ipo_price(shares_outstanding):
     
     return share_price
 
-def generate_all_ipo_prices(all_shares_outstanding):
+def generate_all_ipo_prices(all_shares_outstanding, rng):
     results = []
 
     for shares_outstanding in all_shares_outstanding:
-        results.append(generate_ipo_price(shares_outstanding))
+        results.append(generate_ipo_price(shares_outstanding, rng))
     
     return results
 
-def find_next_friday(date):
-    if date.weekday() == 4:
-        return date
-    
-    days_ahead = 4 - date.weekday()  
-    if days_ahead <= 0:
-        days_ahead += 7
-
-    return date + datetime.timedelta(days = days_ahead)
+def get_fridays(ipo_dates, end_date = FUND_LAST_DAY):
+    first_fridays = find_next_friday(ipo_dates)
+    num_weeks = count_weeks_through(first_fridays, end_date)
 
-def generate_all_following_prices(stocks_info):
-    results = dict()
-    for key, value in stocks_info.items():
-        results[key] = generate_following_prices(value[0], value[1])
-    
-    return results
+    return first_fridays, num_weeks
 
-def generate_following_prices(ipo_date, ipo_price):
-    days = get_fridays(ipo_date)
+def generate_all_following_prices(ids, ipo_dates, ipo_prices, rng, end_date = FUND_LAST_DAY):
+    first_fridays, num_weeks = get_fridays(ipo_dates, end_date)
 
-    price_changes = [1 + (change / 100) for change in np.arange(-2.0, 2.5, 0.2)]
-    last_price = ipo_price
-    prices = [round(last_price, 2)]
+    tables = []
 
-    for i in range(len(days) - 1):
-        current_change = random.choices(price_changes)[0]
-        next_price = round(last_price * current_change, 2)
-        prices.append(next_price)
-        last_price = next_price
-    
-    return pd.DataFrame({'days' : days, 'prices' : prices})   
+    for start in range(0, len(ids), STOCKS_PER_BLOCK):
+        block = slice(start, start + STOCKS_PER_BLOCK)
+        tables.append(generate_following_prices(ids[block], first_fridays[block], num_weeks[block], ipo_prices[block], rng))
 
-def get_fridays(ipo_date, end_date = datetime.date(2024, 5, 31)):
-    next_friday = find_next_friday(ipo_date)
-    
-    fridays = []
+    return pd.concat(tables, ignore_index = True)
 
-    while next_friday <= end_date:
-        fridays.append(next_friday)
-        next_friday += datetime.timedelta(days = 7)
-    
-    return fridays
+def generate_following_prices(ids, first_fridays, num_weeks, ipo_prices, rng):
+    max_weeks = num_weeks.max(initial = 0)
 
-def add_all_ids(price_tables):
-    results = dict()
+    # The first Friday trades at the IPO price and every later week compounds one random move
+    changes = rng.choice(PRICE_CHANGES, size = (len(ids), max_weeks))
+    changes[:, :1] = 1
+    prices = np.round(ipo_prices[:, None] * np.cumprod(changes, axis = 1), 2)
 
-    for key, value in price_tables.items():
-        df = value
-        df['id'] = key
-        results[key] = df
+    # Flatten the stock x week matrix into long format, dropping the weeks past each stock's calendar
+    week_offsets = np.arange(max_weeks)
+    listed = week_offsets < num_weeks[:, None]
+    days = first_fridays[:, None] + (7 * week_offsets).astype('timedelta64[D]')
 
-    return results
+    return pd.DataFrame({'days': days[listed],
+                         'prices': prices[listed],
+                         'id': np.broadcast_to(ids[:, None], listed.shape)[listed]})
 
 def create_sql_tuples(table):
-    tuples = []
-    
-    for index, row in table.iterrows():
-        current_tuple = (row['id'], f'{row['days']}', row['prices'])
-        tuples.append(current_tuple)
+    for stock_id, day, price in table[['id', 'days', 'prices']].itertuples(index = False, name = None):
+        yield (stock_id, day.date(), price)
 
-    return tuples
-
-def load_into_postgresql(table, dbname, user, password, host, port):
+def load_into_postgresql(table, dbname, user, password, host, port, batch_size = DEFAULT_BATCH_SIZE):
     params = {
         'dbname': dbname,
         'user': user,
@@ -146,19 +118,14 @@ def load_into_postgresql(table, dbname, user, password, host, port):
 
     print('Beginning row insertion')
     
-    insert_rows(connection, rows)
+    insert_rows(connection, rows, batch_size)
     connection.close()
 
     print('Loading of all rows complete')
 
-def insert_rows(connection, rows):
-    with connection.cursor() as cur:
-        insert_query = '''
-        INSERT INTO stock_prices (stock_id, date, price)
-        VALUES (%s, %s, %s);
-        '''
-        for row in rows:
-            cur.execute(insert_query, row)
-        connection.commit()
-
-main()
+def insert_rows(connection, rows, batch_size = DEFAULT_BATCH_SIZE):
+    columns = ['stock_id', 'date', 'price']
+    bulk_load(connection, 'stock_prices', columns, rows, batch_size)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import os
+import numpy as np
+import pandas as pd
+
+LAST_PRICE_DATE = pd.Timestamp('2024-05-31') # Matches the last date all_stock_returns_query keeps
+SINGLE_PORTFOLIO_ID = 1 # Matches the portfolio single_portfolio_AUM_query selects
+
+class Parquet_Data_Source:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        # Key is the charting query name, value builds the same frame that query returns from the Parquet files
+        self.loaders = {
+            'total_fund_AUM_query': self.load_total_fund_AUM,
+            'single_portfolio_AUM_query': self.load_single_portfolio_AUM,
+            'strategy_comparison_query': self.load_strategy_comparison,
+            'all_stock_returns_query': self.load_all_stock_returns
+        }
+
+    def load(self, query_name: str, query: str) -> pd.DataFrame:
+        # The query text only applies to postgresql, files are read by the loader registered for the query name
+        return self.loaders[query_name]()
+
+    def stream(self, query_name: str, query: str, chunk_size: int):
+        if query_name == 'total_fund_AUM_query':
+            yield from self.stream_total_fund_AUM(chunk_size)
+        else:
+            yield self.load(query_name, query)
+
+    def read_table(self, table_name: str, columns: list[str], filters: list = None) -> pd.DataFrame:
+        # Only the requested columns are read, and filters are pushed down to skip row groups
+        path = os.path.join(self.directory, f'{table_name}.parquet')
+        table = pd.read_parquet(path, columns = columns, filters = filters)
+
+        # Date columns can come back as python dates or timestamps depending on how they were written
+        for column in ['date', 'ipo_date']:
+            if column in table.columns:
+                table[column] = pd.to_datetime(table[column])
+
+        return table
+
+    def read_portfolio_holdings(self, portfolio_filters: list = None, holdings_filters: list = None) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        portfolios = self.read_table('portfolios', ['id', 'name', 'year_established', 'starting_capital'], portfolio_filters)
+
+        holdings = self.read_table('portfolio_holdings', ['portfolio_id', 'stock_id', 'shares', 'date'], holdings_filters)
+        holdings = holdings.rename(columns = {'shares': 'shares_purchased', 'date': 'purchase_date'})
+
+        # Only the prices of stocks that are actually held are read
+        held_stock_ids = holdings['stock_id'].unique().tolist()
+        prices_filters = [('stock_id', 'in', held_stock_ids)] if held_stock_ids else None
+        prices = self.read_table('stock_prices', ['stock_id', 'date', 'price'], prices_filters)
+
+        return portfolios, holdings, prices
+
+    def load_total_fund_AUM(self) -> pd.DataFrame:
+        portfolios, holdings, prices = self.read_portfolio_holdings()
+        return join_holdings_to_prices(portfolios, holdings, prices)
+
+    def load_single_portfolio_AUM(self) -> pd.DataFrame:
+        portfolios, holdings, prices = self.read_portfolio_holdings([('id', '==', SINGLE_PORTFOLIO_ID)],
+                                                                    [('portfolio_id', '==', SINGLE_PORTFOLIO_ID)])
+        data = join_holdings_to_prices(portfolios, holdings, prices)
+
+        return data.sort_values('date', kind = 'stable', ignore_index = True)
+
+    def stream_total_fund_AUM(self, chunk_size: int):
+        portfolios, holdings, prices = self.read_portfolio_holdings()
+        portfolios = portfolios.sort_values('id', ignore_index = True)
+        prices = prices.sort_values(['stock_id', 'date'], ignore_index = True)
+
+        # Count the rows each portfolio joins to without building them: a holding contributes one row
+        # per price of its stock on or after the purchase date, found by binary search on (stock_id, day)
+        price_keys = prices['stock_id'].to_numpy(np.int64) * 1000000 + prices['date'].to_numpy('datetime64[D]').astype(np.int64)
+        holding_stocks = holdings['stock_id'].to_numpy(np.int64)
+        holding_days = holdings['purchase_date'].to_numpy('datetime64[D]').astype(np.int64)
+        holding_rows = (np.searchsorted(price_keys, (holding_stocks + 1) * 1000000)
+                        - np.searchsorted(price_keys, holding_stocks * 1000000 + holding_days))
+
+        # A portfolio with nothing to join still returns its one row of nulls
+        portfolio_rows = pd.Series(holding_rows).groupby(holdings['portfolio_id'].to_numpy()).sum()
+        portfolio_rows = portfolio_rows.reindex(portfolios['id'], fill_value = 0).clip(lower = 1).to_numpy()
+
+        # Cut the portfolios, in id order, into runs that each join to about chunk_size rows
+        chunk_numbers = (np.cumsum(portfolio_rows) - portfolio_rows) // chunk_size
+
+        for chunk_number, chunk_portfolios in portfolios.groupby(chunk_numbers, sort = True):
+            chunk_holdings = holdings[holdings['portfolio_id'].isin(chunk_portfolios['id'])]
+            chunk_prices = prices[prices['stock_id'].isin(chunk_holdings['stock_id'])]
+
+            yield join_holdings_to_prices(chunk_portfolios, chunk_holdings, chunk_prices)
+
+    def load_strategy_comparison(self) -> pd.DataFrame:
+        portfolios = self.read_table('portfolios', ['strategy'])
+        return portfolios['strategy'].value_counts().rename_axis('strategy').reset_index(name = 'total')
+
+    def load_all_stock_returns(self) -> pd.DataFrame:
+        stocks = self.read_table('stocks', ['id', 'ticker', 'ipo_date'])
+        prices = self.read_table('stock_prices', ['stock_id', 'date', 'price'])
+
+        # Keep each stock's first price and its price on the last trading day
+        first_dates = prices.groupby('stock_id')['date'].transform('min')
+        prices = prices[(prices['date'] == first_dates) | (prices['date'] == LAST_PRICE_DATE)]
+
+        data = stocks.merge(prices, left_on = 'id', right_on = 'stock_id', how = 'left')
+
+        return data.sort_values(['id', 'date'], ignore_index = True)[['id', 'ticker', 'ipo_date', 'date', 'price']]
+
+def join_holdings_to_prices(portfolios: pd.DataFrame, holdings: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFrame:
+    # Same LEFT JOINs as the AUM queries: portfolios without holdings, and holdings without
+    # prices on or after their purchase date, keep a single row of nulls
+    portfolio_holdings = portfolios.merge(holdings, left_on = 'id', right_on = 'portfolio_id', how = 'left')
+    portfolio_holdings = portfolio_holdings.drop(columns = 'portfolio_id').rename_axis('holding_row').reset_index()
+
+    priced = portfolio_holdings.merge(prices, on = 'stock_id', how = 'inner')
+    priced = priced[priced['date'] >= priced['purchase_date']]
+    unpriced = portfolio_holdings[~portfolio_holdings['holding_row'].isin(priced['holding_row'])]
+
+    data = pd.concat([priced, unpriced], ignore_index = True)
+    data = data.sort_values(['id', 'date'], kind = 'stable', ignore_index = True)
+
+    columns = ['id', 'name', 'year_established', 'starting_capital', 'stock_id', 'shares_purchased', 'purchase_date', 'price', 'date']
+    return data[columns]
@@ -0,0 +1,18 @@
+import pandas as pd
+from sqlalchemy import create_engine
+
+class PostgreSQL_Data_Source:
+    def __init__(self, authentication: str, pool_size: int = 5):
+        # A single pooled engine is shared by every query run through this source
+        self.engine = create_engine(authentication, pool_size = pool_size, pool_pre_ping = True)
+
+    def load(self, query_name: str, query: str) -> pd.DataFrame:
+        return pd.read_sql(query, self.engine)
+
+    def stream(self, query_name: str, query: str, chunk_size: int):
+        # A server-side cursor keeps only one chunk of the result in memory at a time
+        with self.engine.connect() as connection:
+            connection = connection.execution_options(stream_results = True, max_row_buffer = chunk_size)
+
+            for chunk in pd.read_sql(query, connection, chunksize = chunk_size):
+                yield chunk
@@ -24,6 +24,7 @@ queries['single_portfolio_AUM_query'] = single_portfolio_AUM_query
 total_fund_AUM_query = '''
     SELECT 
         p.id, 
+        p.name,
         p.year_established, 
         p.starting_capital,
         ph.stock_id,
@@ -62,4 +63,71 @@ all_stock_returns_query = '''
     WHERE rn = 1 OR date = '2024-05-31';
 '''
 
-queries['all_stock_returns_query'] = all_stock_returns_query
\ No newline at end of file
+queries['all_stock_returns_query'] = all_stock_returns_query
+
+# Pre-aggregated alternatives to the AUM queries above. Each row is one portfolio-week holding the
+# summed market value and the cost of the holdings first priced that week, instead of one row per holding-week.
+# Select them by passing aggregated_queries to PPT in place of queries.
+aggregated_queries = dict(queries)
+
+aggregated_single_portfolio_AUM_query = '''
+    WITH holding_values AS (
+        SELECT 
+            ph.portfolio_id,
+            ph.stock_id,
+            sp.date,
+            sp.price * ph.shares AS market_value,
+            sp.date = MIN(sp.date) OVER (PARTITION BY ph.portfolio_id, ph.stock_id) AS is_purchase
+        FROM portfolio_holdings ph
+        JOIN stock_prices sp
+        ON ph.stock_id = sp.stock_id AND sp.date >= ph.date
+        WHERE ph.portfolio_id = 1
+    )
+
+    SELECT 
+        p.id, 
+        p.name,
+        p.year_established, 
+        p.starting_capital, 
+        hv.date,
+        SUM(hv.market_value) AS market_value,
+        SUM(CASE WHEN hv.is_purchase THEN hv.market_value ELSE 0 END) AS purchase_cost,
+        COUNT(DISTINCT hv.stock_id) AS num_stocks_held
+    FROM portfolios p
+    LEFT JOIN holding_values hv
+    ON p.id = hv.portfolio_id
+    WHERE p.id = 1
+    GROUP BY p.id, p.name, p.year_established, p.starting_capital, hv.date
+    ORDER BY hv.date;
+'''
+aggregated_queries['single_portfolio_AUM_query'] = aggregated_single_portfolio_AUM_query
+
+aggregated_total_fund_AUM_query = '''
+    WITH holding_values AS (
+        SELECT 
+            ph.portfolio_id,
+            ph.stock_id,
+            sp.date,
+            sp.price * ph.shares AS market_value,
+            sp.date = MIN(sp.date) OVER (PARTITION BY ph.portfolio_id, ph.stock_id) AS is_purchase
+        FROM portfolio_holdings ph
+        JOIN stock_prices sp
+        ON ph.stock_id = sp.stock_id AND sp.date >= ph.date
+    )
+
+    SELECT 
+        p.id, 
+        p.name,
+        p.year_established, 
+        p.starting_capital,
+        hv.date,
+        SUM(hv.market_value) AS market_value,
+        SUM(CASE WHEN hv.is_purchase THEN hv.market_value ELSE 0 END) AS purchase_cost,
+        COUNT(DISTINCT hv.stock_id) AS num_stocks_held
+    FROM portfolios p
+    LEFT JOIN holding_values hv
+    ON p.id = hv.portfolio_id
+    GROUP BY p.id, p.name, p.year_established, p.starting_capital, hv.date
+    ORDER BY p.id, hv.date;
+'''
+aggregated_queries['total_fund_AUM_query'] = aggregated_total_fund_AUM_query
@@ -0,0 +1,46 @@
+import pandas as pd
+
+# Compact column dtypes for the data returned by the queries in charting_queries, keyed the same way.
+# Columns a query does not return are skipped, so the aggregated queries share these schemas.
+schemas = dict()
+
+AUM_schema = {
+    'id': 'int32',
+    'name': 'category',
+    'stock_id': 'int32',
+    'shares_purchased': 'int32',
+    'purchase_date': 'datetime64[ns]',
+    'date': 'datetime64[ns]',
+    'num_stocks_held': 'int32'
+}
+schemas['single_portfolio_AUM_query'] = AUM_schema
+schemas['total_fund_AUM_query'] = AUM_schema
+
+strategy_comparison_schema = {
+    'strategy': 'category',
+    'total': 'int32'
+}
+schemas['strategy_comparison_query'] = strategy_comparison_schema
+
+all_stock_returns_schema = {
+    'id': 'int32',
+    'ticker': 'category',
+    'ipo_date': 'datetime64[ns]',
+    'date': 'datetime64[ns]'
+}
+schemas['all_stock_returns_query'] = all_stock_returns_schema
+
+def compact_dtypes(data: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    dtypes = dict()
+
+    for column, dtype in schema.items():
+        if column not in data.columns:
+            continue
+
+        # LEFT JOINs leave nulls in id and share columns, which a plain 32-bit int cannot hold
+        if dtype == 'int32' and data[column].isna().any():
+            continue
+
+        dtypes[column] = dtype
+
+    return data.astype(dtypes)
@@ -1,27 +1,37 @@
 import pandas as pd
 import os
+from functools import cached_property
 
 from Chart_Builders.all_stock_returns_scatter_chart import build_all_stock_returns_scatter_chart as build_chart
+from Chart_Builders.all_stock_returns_scatter_chart import build_all_stock_returns_native_chart as build_native_chart
+from Chart_Builders.chart_renderer import Chart_Renderer, export_figure
 
 class All_Stock_Returns_Slide:
     def __init__(self, 
                  data: pd.DataFrame,
-                 image_directory: str
+                 image_directory: str,
+                 renderer: Chart_Renderer = None,
+                 chart_backend: str = 'image'
                  ):
         self.data = data
         self.image_directory = image_directory
+        self.renderer = renderer
+        self.chart_backend = chart_backend
         
         self.title = 'Performance of All Portfolio Stocks from IPO Dates'
-        self.scatter_chart_path = self.build_scatter_chart()
     
+    # The chart is built on first use, so a slide left out of the deck never computes or exports it
+    @cached_property
+    def scatter_chart_path(self) -> str:
+        return self.build_scatter_chart()
+
     def build_scatter_chart(self) -> str:
+        if self.chart_backend == 'native':
+            return build_native_chart(self.data)
+
         figure = build_chart(self.data)
 
         png_file = 'all_stock_returns_scatter_chart.png'
         path = os.path.join(self.image_directory, png_file)
 
-        print('Beginning to save the all stock returns scatter chart')
-        figure.write_image(path)
-        print('Successfully saved the image')
-
-        return path
\ No newline at end of file
+        return export_figure(figure, path, self.renderer)
\ No newline at end of file
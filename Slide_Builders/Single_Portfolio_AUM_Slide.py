@@ -1,8 +1,14 @@
 import pandas as pd
 import os
+from functools import cached_property
 
 from Chart_Builders.single_portfolio_AUM_line_chart import build_single_portfolio_AUM_line_chart as build_spAUM_line_chart
 from Chart_Builders.single_portfolio_AUM_bar_chart import build_single_portfolio_AUM_bar_chart as build_spAUM_bar_chart
+from Chart_Builders.single_portfolio_AUM_line_chart import build_single_portfolio_AUM_native_chart as build_spAUM_native_line_chart
+from Chart_Builders.single_portfolio_AUM_bar_chart import build_single_portfolio_AUM_native_bar_chart as build_spAUM_native_bar_chart
+from Chart_Builders.AUM_engine import compute_weekly_holdings_totals
+from Chart_Builders.chart_renderer import Chart_Renderer, export_figure
+from Chart_Builders.AUM_snapshot_store import AUM_Snapshot_Store
 
 class Single_Portfolio_AUM_Slide:
     NUM_DAYS_PER_YEAR = 365.25 # .25 to account for leap years
@@ -11,10 +17,16 @@ class Single_Portfolio_AUM_Slide:
                  data: pd.DataFrame,
                  benchmark_rate: float, 
                  benchmark_series: list, 
-                 image_directory: str
+                 image_directory: str,
+                 renderer: Chart_Renderer = None,
+                 snapshot_store: AUM_Snapshot_Store = None,
+                 chart_backend: str = 'image'
                  ) -> None:
         
         self.image_directory = image_directory
+        self.renderer = renderer
+        self.snapshot_store = snapshot_store
+        self.chart_backend = chart_backend
         
         self.data = data
         self.portfolio_name = self.data.loc[0, 'name']
@@ -27,13 +39,19 @@ class Single_Portfolio_AUM_Slide:
         self.final_portfolio_value = self.get_portfolio_value(self.data)
         self.benchmark_portfolio_value = self.get_benchmark_value()
         self.year_established = self.data.loc[0, 'year_established']
-        self.num_stocks_held = len(self.data['stock_id'].unique())
+        self.num_stocks_held = self.get_num_stocks_held(self.data)
 
         self.title = f'Portfolio {self.portfolio_name} Performance'
-
-        self.line_chart_path = self.build_line_chart(self.data, self.benchmark_series)
-        self.bar_chart_path = self.build_bar_chart()
     
+    # Charts are built on first use, so a slide left out of the deck never computes or exports them
+    @cached_property
+    def line_chart_path(self):
+        return self.build_line_chart(self.data, self.benchmark_series)
+
+    @cached_property
+    def bar_chart_path(self):
+        return self.build_bar_chart()
+
     def get_num_years(self, data: pd.DataFrame):
         first_date = data['date'].min()
         last_date = data['date'].max()
@@ -50,41 +68,40 @@ class Single_Portfolio_AUM_Slide:
         return cagr
     
     def get_portfolio_value(self, data: pd.DataFrame):
-        last_date = data['date'].max()
-
-        groups = data.groupby('date')
-        portfolio_holdings = groups.get_group(last_date)
+        weekly_totals = compute_weekly_holdings_totals(data)
 
-        final_portfolio_value = 0
-        
-        for index, row in portfolio_holdings.iterrows():
-            final_portfolio_value += row['shares_purchased'] * row['price']
+        final_portfolio_value = weekly_totals['market_value'].iloc[-1]
         
         return round(final_portfolio_value, 2)
 
+    def get_num_stocks_held(self, data: pd.DataFrame):
+        # Data from the aggregated queries carries a holdings count per week instead of one row per stock
+        if 'num_stocks_held' in data.columns:
+            return data.loc[data['date'] == data['date'].max(), 'num_stocks_held'].iloc[0]
+
+        return len(data['stock_id'].unique())
+
     def get_benchmark_value(self):
         return round(self.starting_capital * ((1 + self.benchmark_rate) ** self.num_years), 2)
 
     def build_line_chart(self, data: pd.DataFrame, benchmark_series: list):
-        figure = build_spAUM_line_chart(benchmark_series, data)
+        if self.chart_backend == 'native':
+            return build_spAUM_native_line_chart(benchmark_series, data, self.snapshot_store)
+
+        figure = build_spAUM_line_chart(benchmark_series, data, self.snapshot_store)
 
         png_file = f'portfolio_{self.portfolio_name}_id_{self.portfolio_id}_AUM_line.png'
         path = os.path.join(self.image_directory, png_file)
 
-        print('Beginning to save the single portfolio AUM line chart image')
-        figure.write_image(path)
-        print('Successfully saved the image')
-
-        return path
+        return export_figure(figure, path, self.renderer)
 
     def build_bar_chart(self):
+        if self.chart_backend == 'native':
+            return build_spAUM_native_bar_chart(self.final_portfolio_value, self.benchmark_portfolio_value, self.portfolio_name, self.portfolio_id)
+
         figure = build_spAUM_bar_chart(self.final_portfolio_value, self.benchmark_portfolio_value, self.portfolio_name, self.portfolio_id)
 
         png_file = f'portfolio_{self.portfolio_name}_id_{self.portfolio_id}_AUM_bar.png'
         path = os.path.join(self.image_directory, png_file)
 
-        print('Beginning to save the single portfolio AUM bar chart image')
-        figure.write_image(path)
-        print('Successfully saved the image')
-
-        return path
\ No newline at end of file
+        return export_figure(figure, path, self.renderer)
\ No newline at end of file
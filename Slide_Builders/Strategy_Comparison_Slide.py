@@ -1,29 +1,38 @@
 import pandas as pd
 import os
+from functools import cached_property
 
 from Chart_Builders.strategy_comparison_bar_chart import build_strategy_comparison_chart as build_chart
+from Chart_Builders.strategy_comparison_bar_chart import build_strategy_comparison_native_chart as build_native_chart
+from Chart_Builders.chart_renderer import Chart_Renderer, export_figure
 
 class Strategy_Comparison_Slide:
     def __init__(self,
                  data: pd.DataFrame,
-                 image_directory: str
+                 image_directory: str,
+                 renderer: Chart_Renderer = None,
+                 chart_backend: str = 'image'
                  ):
         
         self.data = data
         self.image_directory = image_directory
+        self.renderer = renderer
+        self.chart_backend = chart_backend
 
         self.title = 'Portfolio Strategy Comparison'
-
-        self.bar_chart_path = self.build_bar_chart()
     
+    # The chart is built on first use, so a slide left out of the deck never computes or exports it
+    @cached_property
+    def bar_chart_path(self) -> str:
+        return self.build_bar_chart()
+
     def build_bar_chart(self) -> str:
+        if self.chart_backend == 'native':
+            return build_native_chart(self.data)
+
         figure = build_chart(self.data)
 
         png_file = 'strategy_comparison_bar_chart.png'
         path = os.path.join(self.image_directory, png_file)
 
-        print('Beginning to save strategy comparison chart')
-        figure.write_image(path)
-        print('Successfully saved image')
-
-        return path
\ No newline at end of file
+        return export_figure(figure, path, self.renderer)
\ No newline at end of file
@@ -1,23 +1,38 @@
 import pandas as pd
 import os
+from functools import cached_property
 
-from Chart_Builders.total_fund_AUM_line_chart import find_first_friday, Portfolio, build_total_fund_AUM_line_chart as build_chart
+from Chart_Builders.total_fund_AUM_line_chart import build_total_fund_AUM_line_chart_from_AUMs as build_chart_from_AUMs
+from Chart_Builders.total_fund_AUM_line_chart import build_total_fund_AUM_native_chart_from_AUMs as build_native_chart_from_AUMs
+from Chart_Builders.total_fund_AUM_line_chart import compute_total_fund_AUM_graph as compute_AUM_graph
+from Chart_Builders.AUM_engine import Total_Fund_AUM_Aggregator
+from Chart_Builders.chart_renderer import Chart_Renderer, export_figure
+from Chart_Builders.AUM_snapshot_store import AUM_Snapshot_Store
 
 class Total_Fund_AUM_Slide:
     def __init__(self, 
-                 data: pd.DataFrame, 
+                 data: pd.DataFrame | Total_Fund_AUM_Aggregator, 
                  image_directory: str,
-                 benchmark_rate: float = 0.08 
+                 benchmark_rate: float = 0.08,
+                 renderer: Chart_Renderer = None,
+                 snapshot_store: AUM_Snapshot_Store = None,
+                 chart_backend: str = 'image'
                  ):
         
         self.data = data
         self.image_directory = image_directory
+        self.renderer = renderer
+        self.snapshot_store = snapshot_store
+        self.chart_backend = chart_backend
         self.title = 'Derik Trading Company AUM vs. Benchmark'
         
         self.benchmark_rate = benchmark_rate
         self.weekly_rate = self.get_weekly_rate()
 
-        self.line_chart_path = self.build_line_chart()
+    # The chart is built on first use, so a slide left out of the deck never computes or exports it
+    @cached_property
+    def line_chart_path(self):
+        return self.build_line_chart()
 
     def get_weekly_rate(self):
         weekly_rate = (1 + self.benchmark_rate) ** (1 / 52)
@@ -25,13 +40,18 @@ class Total_Fund_AUM_Slide:
 
     
     def build_line_chart(self):
-        figure = build_chart(self.weekly_rate, self.data)
+        # A streamed load arrives as an aggregator that has already folded every chunk into weekly totals
+        if isinstance(self.data, Total_Fund_AUM_Aggregator):
+            df_graph = self.data.finish(self.weekly_rate)
+        else:
+            df_graph = compute_AUM_graph(self.weekly_rate, self.data, self.snapshot_store)
+
+        if self.chart_backend == 'native':
+            return build_native_chart_from_AUMs(df_graph)
+
+        figure = build_chart_from_AUMs(df_graph)
 
         png_file = 'total_fund_AUM_line_chart.png'
         path = os.path.join(self.image_directory, png_file)
 
-        print('Beginning to save the total fund AUM line chart image')
-        figure.write_image(path)
-        print('Successfully saved the image')
-
-        return path
\ No newline at end of file
+        return export_figure(figure, path, self.renderer)
\ No newline at end of file
@@ -0,0 +1,44 @@
+class Slide_Spec:
+    def __init__(self, name: str, inputs: list[str], outputs: list[str], build: str, pages: list[str]):
+        self.name = name
+
+        # PPT attributes holding the chart data the slide is computed from
+        self.inputs = inputs
+
+        # Slide attributes holding its charts, an image path or a native chart each
+        self.outputs = outputs
+
+        # PPT method that constructs the slide object from its inputs, in order
+        self.build = build
+
+        # PPT methods that fill each page the slide adds to the deck, in deck order
+        self.pages = pages
+
+        # PPT attribute the built slide object is stored under
+        self.attribute = f'{name}_slide'
+
+class Slide_Registry:
+    def __init__(self):
+        # Key is the slide name, value is its spec. Slides appear in the deck in the order they were registered
+        self.specs = dict()
+
+    def register(self, name: str, inputs: list[str], outputs: list[str], build: str, pages: list[str]) -> Slide_Spec:
+        if name in self.specs:
+            raise ValueError(f'Slide {name!r} is already registered')
+
+        self.specs[name] = Slide_Spec(name, inputs, outputs, build, pages)
+
+        return self.specs[name]
+
+    def __getitem__(self, name: str) -> Slide_Spec:
+        return self.specs[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def get_names(self) -> list[str]:
+        return list(self.specs)
+
+    def get_pages(self, names: list[str]) -> list[tuple[Slide_Spec, str]]:
+        # Every page of the named slides in deck order, whatever order the names were given in
+        return [(spec, page) for spec in self.specs.values() if spec.name in names for page in spec.pages]
@@ -0,0 +1,42 @@
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+
+def move_shapes_to_layout(slide, layout, shapes: list) -> None:
+    # Shapes drawn on a layout appear behind every slide that uses it without being copied into each slide
+    layout_tree = layout.shapes._spTree
+
+    for shape in shapes:
+        element = shape._element
+
+        # Pictures point at their image through the slide's relationships, so re-point them through the layout's
+        for blip in element.xpath('.//a:blip'):
+            image_part = slide.part.related_part(blip.get(qn('r:embed')))
+            blip.set(qn('r:embed'), layout.part.relate_to(image_part, RT.IMAGE))
+
+        layout_tree.append(element)
+
+def format_layout_title(layout, left: int, top: int, width: int, height: int, font_size: int, rgb: str) -> None:
+    title = next(placeholder for placeholder in layout.placeholders if placeholder.placeholder_format.idx == 0)
+
+    title.left, title.top, title.width, title.height = left, top, width, height
+
+    # Text styles on a layout placeholder only reach the slides through its list style
+    text_body = title._element.txBody
+    list_style = text_body.find(qn('a:lstStyle'))
+    text_body.replace(list_style, parse_xml(
+        f'<a:lstStyle {nsdecls("a")}>'
+        f'<a:lvl1pPr algn="ctr"><a:defRPr sz="{font_size * 100}" b="1"><a:solidFill><a:srgbClr val="{rgb}"/></a:solidFill></a:defRPr></a:lvl1pPr>'
+        f'</a:lstStyle>'
+    ))
+    text_body.bodyPr.set('anchor', 'ctr')
+
+def remove_slide(prs: Presentation, slide) -> None:
+    slide_ids = prs.slides._sldIdLst
+
+    for slide_id in slide_ids:
+        if prs.slides.get(int(slide_id.get('id'))) == slide:
+            slide_ids.remove(slide_id)
+            prs.part.drop_rel(slide_id.rId)
+            return
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from Data_Generators.generation_driver import generate_all_tables, STOCKS_PER_PARTITION, PORTFOLIOS_PER_PARTITION
+
+# Just past one partition of each kind, so the run is small but still merges partitions from different workers
+NUM_STOCKS = STOCKS_PER_PARTITION + 10
+NUM_PORTFOLIOS = PORTFOLIOS_PER_PARTITION + 5
+NUM_MANAGERS = 10
+SEED = 7
+
+def test_generation_is_reproducible_across_worker_counts():
+    single_worker_tables = generate_all_tables(NUM_STOCKS, NUM_PORTFOLIOS, NUM_MANAGERS, SEED, workers = 1)
+    two_worker_tables = generate_all_tables(NUM_STOCKS, NUM_PORTFOLIOS, NUM_MANAGERS, SEED, workers = 2)
+
+    assert list(single_worker_tables) == ['portfolio_managers', 'stocks', 'stock_prices', 'portfolios', 'portfolio_holdings']
+
+    for table_name, table in single_worker_tables.items():
+        assert not table.empty, table_name
+        pd.testing.assert_frame_equal(table, two_worker_tables[table_name], obj = table_name)
+
+    assert len(single_worker_tables['stocks']) == NUM_STOCKS
+    assert len(single_worker_tables['portfolios']) == NUM_PORTFOLIOS
@@ -0,0 +1,150 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError: # Windows has no getrusage, so peak memory is left out of the profile there
+    resource = None
+
+def get_peak_rss_mb(who = None) -> float:
+    if resource is None:
+        return None
+
+    # Linux reports the high-water resident set size in kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss / 1024
+
+def measure(function, *args, **kwargs):
+    # Times a call in whichever process runs it, so work done in worker processes can be reported back to the profiler
+    wall_start, cpu_start, peak_start = time.perf_counter(), time.process_time(), get_peak_rss_mb()
+    result = function(*args, **kwargs)
+    peak_end = get_peak_rss_mb()
+
+    timings = {
+        'wall_seconds': time.perf_counter() - wall_start,
+        'cpu_seconds': time.process_time() - cpu_start,
+        'peak_rss_mb': peak_end,
+        'peak_rss_growth_mb': None if peak_end is None else peak_end - peak_start,
+        'pid': os.getpid()
+    }
+
+    return result, timings
+
+class Run_Profiler:
+    def __init__(self, profile_path: str = None, cprofile_path: str = None):
+        # JSON run profile of every stage's timings, written by finish
+        self.profile_path = profile_path
+
+        # cProfile stats of the main thread and of every task profiled with profile_task, merged into one file that
+        # pstats or snakeviz can read
+        self.cprofile_path = cprofile_path
+        self.cprofile = cProfile.Profile() if self.cprofile_path else None
+        self.task_cprofiles = []
+
+        self.started_at = datetime.now()
+        self.run_start = time.perf_counter()
+
+        # One dict per finished stage, appended from whichever thread ran it
+        self.stages = []
+        self.lock = threading.Lock()
+
+        # Each thread tracks the stages it has open so nested stages know their parent
+        self.open_stages = threading.local()
+
+        if self.cprofile:
+            self.cprofile.enable()
+
+    @contextmanager
+    def stage(self, name: str, **details):
+        stack = self.open_stages.__dict__.setdefault('stack', [])
+        parent = stack[-1] if stack else None
+        stack.append(name)
+
+        # CPU time is the calling thread's own, since concurrent query stages share the process clock
+        wall_start, cpu_start, peak_start = time.perf_counter(), time.thread_time(), get_peak_rss_mb()
+
+        try:
+            yield details
+        finally:
+            stack.pop()
+            peak_end = get_peak_rss_mb()
+
+            self.record(name,
+                        wall_seconds = time.perf_counter() - wall_start,
+                        cpu_seconds = time.thread_time() - cpu_start,
+                        peak_rss_mb = peak_end,
+                        peak_rss_growth_mb = None if peak_end is None else peak_end - peak_start,
+                        start_seconds = wall_start - self.run_start,
+                        parent = parent,
+                        thread = threading.current_thread().name,
+                        **details)
+
+    def record(self, name: str, **timings) -> None:
+        # Stages measured elsewhere, such as chart exports in the renderer's worker processes, are added as given
+        # under whichever stage this thread has open
+        if 'parent' not in timings:
+            stack = self.open_stages.__dict__.get('stack')
+            timings['parent'] = stack[-1] if stack else None
+
+        with self.lock:
+            self.stages.append({'name': name, **timings})
+
+    def merge(self, stages: list[dict], parent: str) -> None:
+        for stage in stages:
+            self.record(**{**stage, 'parent': stage.get('parent') or parent})
+
+    def profile_task(self, function):
+        # Before 3.12 a cProfile.Profile only sees the thread that enabled it, so tasks run on worker threads get their
+        # own, merged in finish. From 3.12 cProfile hooks sys.monitoring, which already covers every thread and allows
+        # only one active profiler at a time
+        if self.cprofile is None or sys.version_info >= (3, 12):
+            return function
+
+        def run_profiled():
+            task_cprofile = cProfile.Profile()
+
+            try:
+                return task_cprofile.runcall(function)
+            finally:
+                with self.lock:
+                    self.task_cprofiles.append(task_cprofile)
+
+        return run_profiled
+
+    def get_profile(self) -> dict:
+        return {
+            'started_at': self.started_at.isoformat(timespec = 'seconds'),
+            'wall_seconds': time.perf_counter() - self.run_start,
+            'cpu_seconds': time.process_time(),
+            'peak_rss_mb': get_peak_rss_mb(),
+            'children_peak_rss_mb': get_peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+            'stages': self.stages
+        }
+
+    def finish(self) -> dict:
+        if self.cprofile:
+            self.cprofile.disable()
+
+            stats = pstats.Stats(self.cprofile)
+
+            if self.task_cprofiles:
+                stats.add(*self.task_cprofiles)
+
+            stats.dump_stats(self.cprofile_path)
+            print(f'Saved the cProfile stats to {self.cprofile_path}')
+
+        profile = self.get_profile()
+
+        if self.profile_path:
+            with open(self.profile_path, 'w') as file:
+                json.dump(profile, file, indent = 2, default = str)
+
+            print(f'Saved the run profile to {self.profile_path}')
+
+        return profile
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class Task_Graph:
+    MAX_WORKERS = 8
+
+    def __init__(self):
+        # Key is the task name, value is the function to run and the names of the tasks it waits on
+        self.tasks = dict()
+
+    def add(self, name: str, function, dependencies: list[str] = None) -> None:
+        if name in self.tasks:
+            raise ValueError(f'Task {name!r} is already in the graph')
+
+        self.tasks[name] = (function, list(dependencies or []))
+
+    def get_dependents(self) -> dict[str, list[str]]:
+        dependents = {name: [] for name in self.tasks}
+
+        for name, (_, dependencies) in self.tasks.items():
+            for dependency in dependencies:
+                if dependency not in self.tasks:
+                    raise ValueError(f'Task {name!r} depends on {dependency!r}, which is not in the graph')
+
+                dependents[dependency].append(name)
+
+        return dependents
+
+    def get_order(self) -> list[str]:
+        # Kahn's algorithm, any task left over once no more are ready sits on a cycle
+        dependents = self.get_dependents()
+        waiting = {name: len(dependencies) for name, (_, dependencies) in self.tasks.items()}
+        order = [name for name, count in waiting.items() if count == 0]
+
+        for name in order:
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+
+                if waiting[dependent] == 0:
+                    order.append(dependent)
+
+        if len(order) < len(self.tasks):
+            cycle = sorted(set(self.tasks) - set(order))
+            raise ValueError(f'Tasks {cycle} depend on each other in a cycle')
+
+        return order
+
+    def run(self, max_workers: int = MAX_WORKERS) -> dict:
+        self.get_order()
+
+        dependents = self.get_dependents()
+        waiting = {name: len(dependencies) for name, (_, dependencies) in self.tasks.items()}
+
+        # Key is the task name, value is what its function returned
+        results = dict()
+
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            # Each task starts the moment its last dependency finishes, not when a whole stage of tasks has
+            running = {executor.submit(self.tasks[name][0]): name for name, count in waiting.items() if count == 0}
+
+            while running:
+                done, _ = wait(running, return_when = FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+
+                    # A failed task raises here, and the executor finishes the running tasks before it propagates
+                    results[name] = future.result()
+
+                    for dependent in dependents[name]:
+                        waiting[dependent] -= 1
+
+                        if waiting[dependent] == 0:
+                            running[executor.submit(self.tasks[dependent][0])] = dependent
+
+        return results
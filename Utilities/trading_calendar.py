@@ -0,0 +1,69 @@
+import numpy as np
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+FUND_LAST_DAY = datetime(2024, 5, 31) # Last week with price data
+FRIDAY = 4 # datetime.weekday() numbering, Monday = 0
+
+def find_first_friday(year: int) -> datetime:
+    first_day = datetime(year, 1, 1)
+    days_until_friday = (FRIDAY - first_day.weekday()) % 7
+    return first_day + timedelta(days = days_until_friday)
+
+def find_next_friday(dates) -> np.ndarray:
+    days = np.asarray(dates, dtype = 'datetime64[D]')
+
+    # 1970-01-01 was a Thursday, so the weekday (Monday = 0) is the days since the epoch plus three, mod seven
+    weekdays = (days.astype(np.int64) + 3) % 7
+
+    return days + ((FRIDAY - weekdays) % 7).astype('timedelta64[D]')
+
+def count_weeks_through(first_fridays, last_day = FUND_LAST_DAY) -> np.ndarray:
+    # Fridays from each first Friday up to and including the last day, zero for any that start after it
+    first_fridays = np.asarray(first_fridays, dtype = 'datetime64[D]')
+    last_day = np.datetime64(last_day, 'D')
+
+    return np.maximum((last_day - first_fridays).astype(np.int64) // 7 + 1, 0)
+
+def get_compounding_series(weekly_rate: float, num_weeks: int, first_week: int = 0) -> np.ndarray:
+    # weekly_rate ** k for k = first_week .. first_week + num_weeks - 1
+    return weekly_rate ** np.arange(first_week, first_week + num_weeks, dtype = float)
+
+def get_week_offsets(week_dates, dates) -> np.ndarray:
+    # week_dates is a regular weekly calendar, so a date's position is plain arithmetic on its first day
+    week_dates = np.asarray(week_dates, dtype = 'datetime64[D]')
+    days_since_start = (np.asarray(dates, dtype = 'datetime64[D]') - week_dates[:1]).astype(np.int64)
+
+    offsets = days_since_start // 7
+    on_calendar = (days_since_start % 7 == 0) & (offsets >= 0) & (offsets < len(week_dates))
+
+    # Dates that are not one of the calendar's weeks are marked with -1
+    return np.where(on_calendar, offsets, -1)
+
+class Trading_Calendar:
+    def __init__(self, first_day: datetime, num_weeks: int):
+        self.first_day = np.datetime64(first_day, 'D')
+        self.weeks = self.first_day + 7 * np.arange(num_weeks).astype('timedelta64[D]')
+
+    def __len__(self) -> int:
+        return len(self.weeks)
+
+    def get_dates(self) -> list:
+        # Python dates, which is what the charts and the queries' date columns use
+        return self.weeks.tolist()
+
+    def get_week_offsets(self, dates) -> np.ndarray:
+        return get_week_offsets(self.weeks, dates)
+
+    def get_benchmark_series(self, weekly_rate: float) -> np.ndarray:
+        # Growth of one dollar compounded at weekly_rate, as of the end of each week on the calendar
+        return get_compounding_series(weekly_rate, len(self), first_week = 1)
+
+@lru_cache(maxsize = None)
+def get_fund_calendar(first_year: int) -> Trading_Calendar:
+    first_day = find_first_friday(first_year)
+
+    # Reported weeks run from the first Friday of the year up to, but not including, the last day with data
+    num_weeks = len(range(0, (FUND_LAST_DAY - first_day).days, 7))
+
+    return Trading_Calendar(first_day, num_weeks)
@@ -0,0 +1,128 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+
+from ppt_builder import PPT, get_environment_options
+from Chart_Builders.chart_renderer import Chart_Renderer, WORKER_CONTEXT, warm_up_renderer
+from Utilities.run_profiler import Run_Profiler
+
+load_dotenv()
+
+def build_portfolio_deck(deck_template: PPT, portfolio_data) -> tuple[str, list[dict]]:
+    deck = copy.copy(deck_template)
+
+    # The worker profiles its own deck and hands the stages back to be merged into the batch's run profile
+    deck.profiler = Run_Profiler()
+
+    # Runs inside a deck worker, so the charts are exported in this process through the shared image cache
+    deck.renderer = Chart_Renderer(max_workers = 0, cache = deck.chart_cache, profiler = deck.profiler)
+    deck.single_portfolio_AUM_data = portfolio_data
+    deck.build_slide('single_portfolio_AUM')
+    deck.render_slide('single_portfolio_AUM')
+
+    portfolio_name = deck.single_portfolio_AUM_slide.portfolio_name
+    portfolio_id = deck.single_portfolio_AUM_slide.portfolio_id
+
+    # PPT's single deck build, not the batch fan-out Batch_PPT overrides it with
+    path = PPT.build_ppt(deck, f'Derik_Trading_Company_Report_portfolio_{portfolio_name}_id_{portfolio_id}.pptx')
+
+    return path, deck.profiler.stages
+
+def detach(obj, attributes: list[str]):
+    # Shallow copy without the attributes a deck worker never reads, so it is cheap to send to the worker
+    detached = copy.copy(obj)
+
+    for attribute in attributes:
+        setattr(detached, attribute, None)
+
+    return detached
+
+class Batch_PPT(PPT):
+    MAX_DECK_WORKERS = 4 # Each worker builds and saves whole decks and holds its own Kaleido browser
+
+    def __init__(self,
+                 ppt_directory: str,
+                 image_directory: str,
+                 authentication: str = None,
+                 portfolio_ids: list[int] = None,
+                 max_deck_workers: int = MAX_DECK_WORKERS,
+                 **kwargs
+                 ):
+
+        # Every portfolio's slides are cut from the whole fund dataset, which a streamed load never holds at once
+        if kwargs.get('stream_chunk_size'):
+            raise ValueError('Batch decks need the whole fund dataset, so stream_chunk_size is not supported')
+
+        # Without the single portfolio slide every deck would be identical
+        if kwargs.get('slides') and 'single_portfolio_AUM' not in kwargs['slides']:
+            raise ValueError('Batch decks are built per portfolio, so slides must include single_portfolio_AUM')
+
+        # Build a deck for each of these portfolios, or for every portfolio in the fund when None
+        self.portfolio_ids = portfolio_ids
+        self.max_deck_workers = max_deck_workers
+
+        super().__init__(ppt_directory, image_directory, authentication, **kwargs)
+
+    def get_slides_to_build(self) -> list[str]:
+        # The fund-wide slides are built and rendered once, then shared by every deck.
+        # Each deck builds its own single portfolio slide in build_ppt
+        return [slide_name for slide_name in self.slides if slide_name != 'single_portfolio_AUM']
+
+    def get_required_data(self) -> set[str]:
+        # Portfolios are sliced from the fund dataset even when the total fund slide is left out
+        return super().get_required_data() | {'total_fund_AUM_data'}
+
+    def get_portfolio_data(self):
+        data = self.total_fund_AUM_data
+
+        if self.portfolio_ids is not None:
+            data = data[data['id'].isin(self.portfolio_ids)]
+
+        # One groupby pass instead of a full scan of the fund dataset per portfolio
+        for portfolio_id, portfolio_data in data.groupby('id', sort = True):
+            # Portfolios that never held a priced stock have no AUM history to chart
+            if portfolio_data['date'].isna().all():
+                print(f'Skipping portfolio {portfolio_id}, it has no priced holdings')
+                continue
+
+            yield portfolio_data.sort_values('date', kind = 'stable').reset_index(drop = True)
+
+    def get_deck_template(self) -> PPT:
+        deck_template = detach(self, ['data_source', 'renderer', 'AUM_snapshot_store', 'profiler',
+                                      'total_fund_AUM_data', 'single_portfolio_AUM_data',
+                                      'strategy_comparison_data', 'all_stock_returns_data'])
+
+        # The shared slides are only read for their titles and image paths
+        if self.total_fund_AUM_slide:
+            deck_template.total_fund_AUM_slide = detach(self.total_fund_AUM_slide, ['data', 'renderer', 'snapshot_store'])
+
+        if self.all_stock_returns_slide:
+            deck_template.all_stock_returns_slide = detach(self.all_stock_returns_slide, ['data', 'renderer'])
+
+        if self.strategy_comparison_slide:
+            deck_template.strategy_comparison_slide = detach(self.strategy_comparison_slide, ['data', 'renderer'])
+
+        return deck_template
+
+    def build_ppt(self):
+        deck_template = self.get_deck_template()
+
+        with ProcessPoolExecutor(max_workers = self.max_deck_workers,
+                                 mp_context = WORKER_CONTEXT,
+                                 initializer = warm_up_renderer) as executor:
+            futures = [executor.submit(build_portfolio_deck, deck_template, portfolio_data) for portfolio_data in self.get_portfolio_data()]
+            paths = []
+
+            for future in futures:
+                path, stages = future.result()
+                paths.append(path)
+                self.profiler.merge(stages, f'deck:{os.path.basename(path)}')
+
+        print(f'Batch complete, built {len(paths)} presentations in {self.ppt_directory}')
+
+        return paths
+
+# Guarded so deck worker processes can import this module without starting another batch
+if __name__ == '__main__':
+    batch = Batch_PPT(**get_environment_options())
@@ -1,49 +1,108 @@
-from sqlalchemy import create_engine
-import pandas as pd
-from datetime import datetime, timedelta
 from pptx import Presentation
 from pptx.util import Cm, Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 import os
+from functools import partial
 from dotenv import load_dotenv
 
 from SQL_Queries.charting_queries import queries as charting_queries
+from SQL_Queries.charting_schemas import schemas as chart_schemas, compact_dtypes as apply_chart_schema
+from Chart_Builders.AUM_engine import slice_portfolio_data, Total_Fund_AUM_Aggregator
 from Slide_Builders.Single_Portfolio_AUM_Slide import Single_Portfolio_AUM_Slide as spAUM_slide
 from Slide_Builders.Total_Fund_AUM_Slide import Total_Fund_AUM_Slide as tfAUM_slide
 from Slide_Builders.All_Stock_Returns_Slide import All_Stock_Returns_Slide as asr_slide
 from Slide_Builders.Strategy_Comparison_Slide import Strategy_Comparison_Slide as sc_slide
+from Chart_Builders.chart_renderer import Chart_Renderer
+from Chart_Builders.chart_image_cache import Chart_Image_Cache
+from Chart_Builders.AUM_snapshot_store import AUM_Snapshot_Store
+from Data_Sources.postgresql_data_source import PostgreSQL_Data_Source
+from Data_Sources.parquet_data_source import Parquet_Data_Source
+from Slide_Builders.slide_template import move_shapes_to_layout, format_layout_title, remove_slide
+from Slide_Builders.slide_registry import Slide_Registry
+from Utilities.trading_calendar import FUND_LAST_DAY, find_first_friday, get_fund_calendar
+from Utilities.run_profiler import Run_Profiler
+from Utilities.task_graph import Task_Graph
 
 load_dotenv()
 
+# Each slide declares the chart data it reads, the charts it outputs, the PPT method that builds it and the
+# PPT methods that fill its pages. The deck follows registration order
+slide_registry = Slide_Registry()
+
+slide_registry.register('single_portfolio_AUM',
+                        inputs = ['single_portfolio_AUM_data'],
+                        outputs = ['line_chart_path', 'bar_chart_path'],
+                        build = 'build_single_portfolio_AUM_slide',
+                        pages = ['add_single_portfolio_AUM_line_chart', 'add_single_portfolio_AUM_summary'])
+
+slide_registry.register('total_fund_AUM',
+                        inputs = ['total_fund_AUM_data'],
+                        outputs = ['line_chart_path'],
+                        build = 'build_total_fund_AUM_slide',
+                        pages = ['add_total_fund_AUM_line_chart'])
+
+slide_registry.register('all_stock_returns',
+                        inputs = ['all_stock_returns_data'],
+                        outputs = ['scatter_chart_path'],
+                        build = 'build_all_stock_returns_slide',
+                        pages = ['add_all_stock_returns_scatter_chart'])
+
+slide_registry.register('strategy_comparison',
+                        inputs = ['strategy_comparison_data'],
+                        outputs = ['bar_chart_path'],
+                        build = 'build_strategy_comparison_slide',
+                        pages = ['add_strategy_comparison_bar_chart'])
+
 class PPT:
     COMPOUNDING_PERIODS = 52 # Assume weekly compounding periods
     FUND_FIRST_YEAR = 1991 # derik_trading_company was established in 1991
-    NUM_SLIDES = 5 # Presentations of this format will have five slides
-    
-    @classmethod
-    def find_first_friday(cls, year):
-        first_day = datetime(year, 1, 1)
-        first_day_type = first_day.weekday()
-        days_until_friday = (4 - first_day_type) % 7
-        days_until_friday = days_until_friday + 7 if days_until_friday < 0 else days_until_friday
-        return first_day + timedelta(days = days_until_friday)
+    MAX_QUERY_WORKERS = 4 # One connection per chart query so independent queries run concurrently
+    MAX_TASK_WORKERS = 8 # Query, chart, export and assembly tasks share one thread pool
+    PPT_FILE = 'Derik_Trading_Company_Report.pptx'
+    SLIDE_LAYOUT = 5 # Title Only layout of the default template
+    SINGLE_PORTFOLIO_QUERY_ID = 1 # The portfolio single_portfolio_AUM_query selects
+
+    # Key is the attribute the data is stored under, value is the name of the query that loads it.
+    # The single portfolio data is sliced from the total fund data when that is loaded anyway
+    CHART_DATA_QUERIES = {
+        'total_fund_AUM_data': 'total_fund_AUM_query',
+        'single_portfolio_AUM_data': 'single_portfolio_AUM_query',
+        'strategy_comparison_data': 'strategy_comparison_query',
+        'all_stock_returns_data': 'all_stock_returns_query'
+    }
     
     @classmethod
     def initialize_class_dates(cls): 
-        cls.FUND_FIRST_TRADING_DAY = cls.find_first_friday(cls.FUND_FIRST_YEAR)
-        cls.FUND_LAST_TRADING_DAY = datetime(2024, 5, 31)
-        cls.FUND_TRADING_WEEKS = int((cls.FUND_LAST_TRADING_DAY - cls.FUND_FIRST_TRADING_DAY).days / 7)
+        cls.FUND_CALENDAR = get_fund_calendar(cls.FUND_FIRST_YEAR)
+        cls.FUND_FIRST_TRADING_DAY = find_first_friday(cls.FUND_FIRST_YEAR)
+        cls.FUND_LAST_TRADING_DAY = FUND_LAST_DAY
+        cls.FUND_TRADING_WEEKS = len(cls.FUND_CALENDAR)
 
     def __init__(self,  
                  ppt_directory: str,
                  image_directory: str,
-                 authentication: str,
+                 authentication: str = None,
                  benchmark_rate: float = 0.08,
-                 queries: dict = None
+                 queries: dict = None,
+                 single_portfolio_id: int = 1,
+                 chart_cache_directory: str = None,
+                 stream_chunk_size: int = None,
+                 compact_dtypes: bool = True,
+                 data_source = None,
+                 AUM_snapshot_directory: str = None,
+                 slide_template: str = None,
+                 chart_backends: dict = None,
+                 profile_path: str = None,
+                 cprofile_path: str = None,
+                 slides: list[str] = None
                  ):
         
+        # Records the wall time, CPU time and peak memory of every stage, saved as JSON to profile_path
+        # and, when cprofile_path is set, as cProfile stats of the main thread merged with those of every task
+        self.profiler = Run_Profiler(profile_path, cprofile_path)
+
         PPT.initialize_class_dates()
 
         self.ppt_directory = ppt_directory
@@ -58,32 +117,48 @@ class PPT:
         self.all_stock_returns_query = None # Scatter plot of each stock's annualized return vs when it IPO'd
         self.queries = self.preprocess_queries(queries)
 
-        self.total_fund_AUM_data = self.load_from_postgresql(self.total_fund_AUM_query, authentication)
-        self.single_portfolio_AUM_data = self.load_from_postgresql(self.single_portfolio_AUM_query, authentication)
-        self.strategy_comparison_data = self.load_from_postgresql(self.strategy_comparison_query, authentication)
-        self.all_stock_returns_data = self.load_from_postgresql(self.all_stock_returns_query, authentication)
-
-        self.single_portfolio_AUM_slide = spAUM_slide(self.single_portfolio_AUM_data, 
-                                                      benchmark_rate, 
-                                                      self.benchmark_return_sequence, 
-                                                      self.image_directory)
-        self.total_fund_AUM_slide = tfAUM_slide(self.total_fund_AUM_data,
-                                                self.image_directory,
-                                                self.benchmark_rate
-                                                )
-        self.all_stock_returns_slide = asr_slide(self.all_stock_returns_data,
-                                                 self.image_directory)
-        
-        self.strategy_comparison_slide = sc_slide(self.strategy_comparison_data,
-                                                  self.image_directory)
-
-        self.slide_titles = [self.single_portfolio_AUM_slide.title,
-                             self.single_portfolio_AUM_slide.title,
-                             self.total_fund_AUM_slide.title,
-                             self.all_stock_returns_slide.title,
-                             self.strategy_comparison_slide.title]
-        self.ppt = self.build_ppt()
-        print(f'Presentation complete, find it at {self.ppt}')
+        # Chart data comes from postgresql unless another source, such as Parquet files, is given
+        self.data_source = data_source or PostgreSQL_Data_Source(authentication, pool_size = PPT.MAX_QUERY_WORKERS)
+
+        self.single_portfolio_id = single_portfolio_id
+
+        # Only these registered slides are queried, computed and added to the deck. Every slide when None
+        self.slides = slides or slide_registry.get_names()
+
+        for slide_name in self.slides:
+            if slide_name not in slide_registry:
+                raise ValueError(f'Unknown slide {slide_name!r}, expected one of {slide_registry.get_names()}')
+
+        # When set, the total fund dataset is streamed in chunks of this many rows instead of loaded whole
+        self.stream_chunk_size = stream_chunk_size
+
+        # Downcast loaded data to the compact dtypes in SQL_Queries/charting_schemas.py
+        self.compact_dtypes = compact_dtypes
+
+        # Charts whose figure is unchanged since a previous run are copied from this cache instead of re-rendered
+        self.chart_cache_directory = chart_cache_directory or os.path.join(self.image_directory, 'chart_cache')
+        self.chart_cache = Chart_Image_Cache(self.chart_cache_directory)
+
+        # Weekly portfolio AUMs persisted between runs, so each rebuild only computes the weeks since the last one
+        self.AUM_snapshot_store = AUM_Snapshot_Store(AUM_snapshot_directory) if AUM_snapshot_directory else None
+
+        # Key is a registered slide name, value is 'native' to draw its charts as PowerPoint charts
+        # instead of exporting them as images. Slides not listed use images
+        self.chart_backends = chart_backends or dict()
+
+        for slide_name, backend in self.chart_backends.items():
+            if slide_name not in slide_registry or backend not in ('image', 'native'):
+                raise ValueError(f"Unknown chart backend {backend!r} for slide {slide_name!r}, expected 'image' or 'native' for one of {slide_registry.get_names()}")
+
+        # Slides queue their figures here and each slide's exports run in the renderer's worker processes
+        self.renderer = Chart_Renderer(cache = self.chart_cache, profiler = self.profiler)
+
+        # With a template, the header and logo are drawn once in its slide layout instead of on every slide.
+        # It is generated at this path on first use, delete it to pick up a new logo
+        self.slide_template = slide_template
+
+        self.ppt = self.run_tasks()
+        self.profiler.finish()
     
     def preprocess_queries(self, queries):
         if not queries:
@@ -95,40 +170,224 @@ class PPT:
 
         return queries
 
-    def load_from_postgresql(self, query, authentication):
+    def run_tasks(self):
+        graph = self.build_task_graph()
+
+        try:
+            with self.profiler.stage('run_tasks', tasks = len(graph.tasks)):
+                results = graph.run(PPT.MAX_TASK_WORKERS)
+        finally:
+            self.renderer.close()
+
+        return results['assemble']
+
+    def build_task_graph(self) -> Task_Graph:
+        # Every task starts as soon as the tasks it depends on finish, so a slide's charts are computed
+        # and exported while slower queries are still running
+        graph = Task_Graph()
+        slide_names = self.get_slides_to_build()
+        required_data = self.get_required_data()
+
+        # Tasks run on the graph's worker threads, which the main thread's cProfile does not see
+        profile_task = self.profiler.profile_task
+
+        # Data no built slide reads is never queried, and slides that are not built stay None
+        for key in PPT.CHART_DATA_QUERIES:
+            setattr(self, key, None)
+
+        for slide_name in slide_registry.get_names():
+            setattr(self, slide_registry[slide_name].attribute, None)
+
+        for key in required_data:
+            dependencies = ['total_fund_AUM_data'] if key == 'single_portfolio_AUM_data' and 'total_fund_AUM_data' in required_data else []
+            graph.add(key, profile_task(partial(self.load_chart_data, key)), dependencies)
+
+        for slide_name in slide_names:
+            graph.add(f'build:{slide_name}', profile_task(partial(self.build_slide, slide_name)), slide_registry[slide_name].inputs)
+            graph.add(f'render:{slide_name}', profile_task(partial(self.render_slide, slide_name)), [f'build:{slide_name}'])
+
+        assembly_dependencies = [f'render:{slide_name}' for slide_name in slide_names]
+
+        if self.slide_template and not os.path.exists(self.slide_template):
+            graph.add('slide_template', profile_task(partial(self.build_slide_template, self.slide_template)))
+            assembly_dependencies.append('slide_template')
+
+        # python-pptx is not thread safe, so one task assembles and saves the deck once every chart is exported
+        graph.add('assemble', profile_task(self.build_ppt), assembly_dependencies)
+
+        return graph
+
+    def get_slides_to_build(self) -> list[str]:
+        return self.slides
+
+    def get_required_data(self) -> set[str]:
+        required_data = {key for slide_name in self.get_slides_to_build() for key in slide_registry[slide_name].inputs}
+
+        # The single portfolio query only selects one portfolio, any other is sliced from the fund dataset
+        if 'single_portfolio_AUM_data' in required_data and self.single_portfolio_id != PPT.SINGLE_PORTFOLIO_QUERY_ID:
+            required_data.add('total_fund_AUM_data')
+
+        return required_data
+
+    def load_chart_data(self, key: str):
+        if key == 'single_portfolio_AUM_data':
+            data = self.load_single_portfolio_AUM_data()
+        elif key == 'total_fund_AUM_data' and self.stream_chunk_size:
+            data = self.stream_total_fund_AUM_data()
+        else:
+            data = self.load_query_data(PPT.CHART_DATA_QUERIES[key])
+
+        setattr(self, key, data)
+
+        return data
+
+    def load_single_portfolio_AUM_data(self):
+        if isinstance(self.total_fund_AUM_data, Total_Fund_AUM_Aggregator):
+            return self.total_fund_AUM_data.get_retained_portfolio_data()
+
+        # The single portfolio view is a slice of the fund-wide dataset, so only query for it when that dataset is unavailable
+        if self.total_fund_AUM_data is None or 'name' not in self.total_fund_AUM_data.columns:
+            return self.load_query_data('single_portfolio_AUM_query')
+        
+        return slice_portfolio_data(self.total_fund_AUM_data, self.single_portfolio_id)
+
+    def load_query_data(self, query_name):
+        query = getattr(self, query_name)
+
         if not query:
             return None
         
-        engine = create_engine(authentication)
-        data = pd.read_sql(query, engine)
+        with self.profiler.stage(f'query:{query_name}') as details:
+            data = self.data_source.load(query_name, query)
+            details['rows'] = len(data)
+
+        with self.profiler.stage(f'compact:{query_name}'):
+            return self.compact_chart_data(data, query_name)
+
+    def compact_chart_data(self, data, query_name, report = True):
+        if not self.compact_dtypes:
+            return data
+
+        memory_before = data.memory_usage(deep = True).sum() / 1024 ** 2
+        data = apply_chart_schema(data, chart_schemas[query_name])
+        memory_after = data.memory_usage(deep = True).sum() / 1024 ** 2
+
+        if report:
+            print(f'Compacted {query_name} data from {memory_before:,.2f} MB to {memory_after:,.2f} MB')
+
         return data
+
+    def stream_total_fund_AUM_data(self):
+        if not self.total_fund_AUM_query:
+            return None
+
+        aggregator = Total_Fund_AUM_Aggregator(retained_portfolio_id = self.single_portfolio_id)
+
+        # Reading the chunks and folding them into the aggregator interleave, so they are timed as one stage
+        with self.profiler.stage('query:total_fund_AUM_query', chunk_size = self.stream_chunk_size) as details:
+            details['rows'] = 0
+
+            for chunk in self.data_source.stream('total_fund_AUM_query', self.total_fund_AUM_query, self.stream_chunk_size):
+                aggregator.add_chunk(self.compact_chart_data(chunk, 'total_fund_AUM_query', report = False))
+                details['rows'] += len(chunk)
+
+        return aggregator
     
+    def build_slide(self, slide_name: str):
+        spec = slide_registry[slide_name]
+
+        with self.profiler.stage(f'chart:{slide_name}'):
+            slide = getattr(self, spec.build)(*[getattr(self, key) for key in spec.inputs])
+
+            # Requesting the outputs computes the charts and queues their exports
+            for output in spec.outputs:
+                getattr(slide, output)
+
+        setattr(self, spec.attribute, slide)
+
+        return slide
+
+    def render_slide(self, slide_name: str) -> list[str]:
+        spec = slide_registry[slide_name]
+        slide = getattr(self, spec.attribute)
+
+        # Native charts are drawn when the deck is assembled, so only image paths have exports to wait on
+        charts = [getattr(slide, output) for output in spec.outputs]
+
+        with self.profiler.stage(f'render:{slide_name}'):
+            return self.renderer.render([chart for chart in charts if isinstance(chart, str)])
+
+    def build_single_portfolio_AUM_slide(self, data):
+        return spAUM_slide(data, 
+                           self.benchmark_rate, 
+                           self.benchmark_return_sequence, 
+                           self.image_directory,
+                           self.renderer,
+                           self.AUM_snapshot_store,
+                           self.get_chart_backend('single_portfolio_AUM'))
+
+    def build_total_fund_AUM_slide(self, data):
+        return tfAUM_slide(data,
+                           self.image_directory,
+                           self.benchmark_rate,
+                           self.renderer,
+                           self.AUM_snapshot_store,
+                           self.get_chart_backend('total_fund_AUM'))
+
+    def build_all_stock_returns_slide(self, data):
+        return asr_slide(data,
+                         self.image_directory,
+                         self.renderer,
+                         self.get_chart_backend('all_stock_returns'))
+
+    def build_strategy_comparison_slide(self, data):
+        return sc_slide(data,
+                        self.image_directory,
+                        self.renderer,
+                        self.get_chart_backend('strategy_comparison'))
+
+    def get_chart_backend(self, slide_name: str) -> str:
+        return self.chart_backends.get(slide_name, 'image')
+
     def get_benchmark_series(self, benchmark_rate):
         weekly_return_rate = (1 + benchmark_rate) ** (1 / PPT.COMPOUNDING_PERIODS) - 1
-        benchmark_series = [(1 + weekly_return_rate) ** i for i in range(1, PPT.FUND_TRADING_WEEKS + 1)]
-        return benchmark_series
+        return PPT.FUND_CALENDAR.get_benchmark_series(1 + weekly_return_rate)
 
-    def build_ppt(self):
-        prs = Presentation()  
+    def build_ppt(self, ppt_file: str = PPT_FILE):
+        pages = slide_registry.get_pages(self.slides)
+        self.slide_titles = [getattr(self, spec.attribute).title for spec, page in pages]
 
-        num_slides = PPT.NUM_SLIDES
+        with self.profiler.stage('assemble_slides', ppt_file = ppt_file):
+            prs = Presentation(self.slide_template) if self.slide_template else Presentation()
 
-        for i in range(num_slides):
-            prs = self.apply_default_slide_format(prs, self.slide_titles[i])
+            with self.profiler.stage('format_slides'):
+                for title in self.slide_titles:
+                    prs = self.apply_default_slide_format(prs, title)
 
-        for i in range(num_slides):
-            prs = self.build_slide(i, prs)
+            for slide, (spec, page) in zip(prs.slides, pages):
+                with self.profiler.stage(f'page:{page}'):
+                    prs = getattr(self, page)(prs, slide)
 
         print('Beginning to save the new presentation')
-        ppt_file = 'Derik_Trading_Company_Report.pptx'
         path = os.path.join(self.ppt_directory, ppt_file)
-        prs.save(path)
+
+        with self.profiler.stage('save', ppt_file = ppt_file):
+            prs.save(path)
+
         print('Finished saving the new presentation')
+        print(f'Presentation complete, find it at {path}')
 
         return path
     
     def apply_default_slide_format(self, prs: Presentation, title: str) -> Presentation:
-        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        # The template's layout already draws the header and logo, so its slides only need their title
+        if self.slide_template:
+            slide = prs.slides.add_slide(prs.slide_layouts[PPT.SLIDE_LAYOUT])
+            slide.shapes.title.text = title
+
+            return prs
+
+        slide = prs.slides.add_slide(prs.slide_layouts[PPT.SLIDE_LAYOUT])
         
         # Remove the title placeholder
         for shape in slide.shapes:
@@ -138,6 +397,12 @@ class PPT:
                     sp = shape
                     slide.shapes._spTree.remove(sp._element)
 
+        self.add_slide_header(prs, slide, title)
+        self.add_slide_logo(slide)
+
+        return prs
+
+    def add_slide_header(self, prs: Presentation, slide, title: str):
         # Add a blue rectangle across the top of the slide
         top_rectangle = slide.shapes.add_shape(
             MSO_SHAPE.RECTANGLE,  # Shape type
@@ -168,54 +433,67 @@ class PPT:
         # Center-align the text frame within the rectangle
         text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
 
+        return top_rectangle
+
+    def add_slide_logo(self, slide):
         # Add logo image to the bottom left corner
-        slide.shapes.add_picture(os.path.join(self.image_directory, 'RBC_Logo.png'), 
-                                Cm(0.2),  # Left position
-                                Cm(17.62), # Top position
-                                Cm(0.98), # Width
-                                Cm(1.28) # Height
-                                )
+        logo = slide.shapes.add_picture(os.path.join(self.image_directory, 'RBC_Logo.png'), 
+                                        Cm(0.2),  # Left position
+                                        Cm(17.62), # Top position
+                                        Cm(0.98), # Width
+                                        Cm(1.28) # Height
+                                        )
 
-        return prs
-    
-    def build_slide(self, slide_num: int, prs: Presentation) -> Presentation:
-        if slide_num == 0:
-            prs = self.build_slide_1(prs)
-        elif slide_num == 1:
-            prs = self.build_slide_2(prs)
-        elif slide_num == 2:
-            prs = self.build_slide_3(prs)
-        elif slide_num == 3:
-            prs = self.build_slide_4(prs)
-        else:
-            prs = self.build_slide_5(prs)
-        
-        return prs
+        return logo
+
+    def build_slide_template(self, path: str) -> str:
+        with self.profiler.stage('build_slide_template'):
+            prs = Presentation()
+            layout = prs.slide_layouts[PPT.SLIDE_LAYOUT]
+
+            # Draw the header and logo once on a scratch slide, then hand them to the layout every slide is built from
+            slide = prs.slides.add_slide(layout)
+            header = self.add_slide_header(prs, slide, '')
+            logo = self.add_slide_logo(slide)
+
+            move_shapes_to_layout(slide, layout, [header, logo])
+            format_layout_title(layout, Cm(0), Cm(0), prs.slide_width, Cm(2), 28, 'FFFFFF')
+            remove_slide(prs, slide)
 
-    def build_slide_1(self, prs: Presentation) -> Presentation:
-        slide = prs.slides[0]
+            prs.save(path)
+            print(f'Saved the slide template to {path}')
 
-        # Add line chart image
-        slide.shapes.add_picture(self.single_portfolio_AUM_slide.line_chart_path, 
-                                 Cm(2.3), # Left position
-                                 Cm(2.54), # Top position
-                                 Cm(20.8), # Width
-                                 Cm(14.85) # Height
-                                )
+        return path
+    
+    def add_chart(self, slide, chart, left: int, top: int, width: int, height: int):
+        # Slides hand back the path of an exported image, or a native chart to draw in its place
+        if isinstance(chart, str):
+            return slide.shapes.add_picture(chart, left, top, width, height)
+
+        return chart.add_to(slide, left, top, width, height)
+
+    def add_single_portfolio_AUM_line_chart(self, prs: Presentation, slide) -> Presentation:
+        # Add line chart
+        self.add_chart(slide,
+                       self.single_portfolio_AUM_slide.line_chart_path,
+                       Cm(2.3), # Left position
+                       Cm(2.54), # Top position
+                       Cm(20.8), # Width
+                       Cm(14.85) # Height
+                       )
         
         return prs
     
-    def build_slide_2(self, prs: Presentation) -> Presentation:
-        
-        slide = prs.slides[1]
-
-        # Add bar chart image
-        slide.shapes.add_picture(self.single_portfolio_AUM_slide.bar_chart_path,
-                                 Cm(0.7), # Left position
-                                 Cm(4.7),  # Top position
-                                 Cm(16.06), # Width
-                                 Cm(10.71) # Height
-                                 )
+    def add_single_portfolio_AUM_summary(self, prs: Presentation, slide) -> Presentation:
+
+        # Add bar chart
+        self.add_chart(slide,
+                       self.single_portfolio_AUM_slide.bar_chart_path,
+                       Cm(0.7), # Left position
+                       Cm(4.7),  # Top position
+                       Cm(16.06), # Width
+                       Cm(10.71) # Height
+                       )
         
         benchmark_rate = self.single_portfolio_AUM_slide.benchmark_rate * 100
         annualized_rate = self.single_portfolio_AUM_slide.annualized_portfolio_return * 100
@@ -246,46 +524,67 @@ class PPT:
 
         return prs
         
-    def build_slide_3(self, prs: Presentation) -> Presentation:
-        slide = prs.slides[2]
-
-        # Add line chart image
-        slide.shapes.add_picture(self.total_fund_AUM_slide.line_chart_path, 
-                                 Cm(2.3), # Left position
-                                 Cm(2.54), # Top position
-                                 Cm(20.8), # Width
-                                 Cm(14.85) # Height
-                                )
+    def add_total_fund_AUM_line_chart(self, prs: Presentation, slide) -> Presentation:
+        # Add line chart
+        self.add_chart(slide,
+                       self.total_fund_AUM_slide.line_chart_path,
+                       Cm(2.3), # Left position
+                       Cm(2.54), # Top position
+                       Cm(20.8), # Width
+                       Cm(14.85) # Height
+                       )
         
         return prs
     
-    def build_slide_4(self, prs: Presentation) -> Presentation:
-        slide = prs.slides[3]
-
-        # Add scatter chart image
-        slide.shapes.add_picture(self.all_stock_returns_slide.scatter_chart_path,
-                                  Cm(2.3), # Left position
-                                  Cm(2.54), # Top position
-                                  Cm(20.8), # Width
-                                  Cm(14.85) # Height
-                                  )
+    def add_all_stock_returns_scatter_chart(self, prs: Presentation, slide) -> Presentation:
+        # Add scatter chart
+        self.add_chart(slide,
+                       self.all_stock_returns_slide.scatter_chart_path,
+                       Cm(2.3), # Left position
+                       Cm(2.54), # Top position
+                       Cm(20.8), # Width
+                       Cm(14.85) # Height
+                       )
         
         return prs
     
-    def build_slide_5(self, prs: Presentation) -> Presentation:
-        slide = prs.slides[4]
-
-        slide.shapes.add_picture(self.strategy_comparison_slide.bar_chart_path,
-                                 Cm(2.3), # Left position
-                                 Cm(2.54), # Top position
-                                 Cm(20.8), # Width
-                                 Cm(14.85) # Height
-                                 )
+    def add_strategy_comparison_bar_chart(self, prs: Presentation, slide) -> Presentation:
+        self.add_chart(slide,
+                       self.strategy_comparison_slide.bar_chart_path,
+                       Cm(2.3), # Left position
+                       Cm(2.54), # Top position
+                       Cm(20.8), # Width
+                       Cm(14.85) # Height
+                       )
         
         return prs
 
-authentication = os.getenv('DATABASE_URL')
-ppt_directory = os.getenv('PPT_DIRECTORY')
-image_directory = os.getenv('IMAGE_DIRECTORY')
-
-test = PPT(ppt_directory = ppt_directory, image_directory = image_directory, authentication = authentication, queries = charting_queries)
\ No newline at end of file
+def get_environment_options() -> dict:
+    # Build from generated Parquet files instead of postgresql when a directory of them is configured
+    parquet_directory = os.getenv('PARQUET_DIRECTORY')
+    data_source = Parquet_Data_Source(parquet_directory) if parquet_directory else None
+
+    # Comma separated registered slide names to draw as native PowerPoint charts
+    native_chart_slides = os.getenv('NATIVE_CHART_SLIDES')
+    chart_backends = {slide_name: 'native' for slide_name in native_chart_slides.split(',')} if native_chart_slides else None
+
+    # Comma separated registered slide names to build decks of only those slides
+    slides = os.getenv('SLIDES').split(',') if os.getenv('SLIDES') else None
+
+    return {
+        'ppt_directory': os.getenv('PPT_DIRECTORY'),
+        'image_directory': os.getenv('IMAGE_DIRECTORY'),
+        'authentication': os.getenv('DATABASE_URL'),
+        'queries': charting_queries,
+        'data_source': data_source,
+        'AUM_snapshot_directory': os.getenv('AUM_SNAPSHOT_DIRECTORY'),
+        'slide_template': os.getenv('SLIDE_TEMPLATE'),
+        'chart_backends': chart_backends,
+        'profile_path': os.getenv('RUN_PROFILE'),
+        'cprofile_path': os.getenv('RUN_CPROFILE'),
+        'slides': slides
+    }
+
+# Guarded so chart rendering worker processes can import this module without building a presentation
+if __name__ == '__main__':
+    test = PPT(**get_environment_options())
\ No newline at end of file